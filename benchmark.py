@@ -0,0 +1,296 @@
+"""Бенчмарк горячих путей игры без окна и OpenGL
+
+Генерация уровней, коллизии и шаг симуляции замеряются на фиксированных
+зернах со скриптованным вводом для уровней 1-5 и для синтетических
+уровней с 10x и 100x платформ.
+
+    python benchmark.py                         # замер и вывод таблицы
+    python benchmark.py --save-baseline base.json
+    python benchmark.py --baseline base.json    # сравнение с базой
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import main
+
+BENCHMARK_SEED = 20240601
+DEFAULT_TICKS = 1800
+DEFAULT_GENERATION_ROUNDS = 5
+REGRESSION_THRESHOLD = 0.20  # +20% ко времени считается регрессией
+REWIND_MARGIN = 600  # px до конца уровня, после которых трасса начинается заново
+
+# (имя, уровень, множитель количества платформ и длины уровня)
+SCENARIOS = [
+    ("level1", 1, 1),
+    ("level2", 2, 1),
+    ("level3", 3, 1),
+    ("level4", 4, 1),
+    ("level5", 5, 1),
+    ("level5_x10", 5, 10),
+    ("level5_x100", 5, 100),
+]
+
+# Методы, время которых собирается во время прогона
+GENERATOR_FUNCTIONS = ["spawn_platform", "spawn_world_elements"]
+WORLD_FUNCTIONS = [
+    "_spawn_world_elements",
+    "_check_coin_collisions",
+    "_check_letter_collisions",
+    "check_spikes_collision",
+    "check_fall_damage",
+    "_stream_chunks",
+    "update",
+]
+
+
+class Timings:
+    """Накопитель времени вызовов обернутых методов"""
+
+    def __init__(self):
+        self.total = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def wrap(self, obj, name):
+        """Подменяет метод экземпляра на версию с замером времени"""
+        func = getattr(obj, name)
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.total[name] += perf_counter() - start
+                self.calls[name] += 1
+
+        setattr(obj, name, timed)
+
+    def report(self):
+        return {
+            name: {
+                "calls": self.calls[name],
+                "total_ms": self.total[name] * 1000,
+                "mean_us": self.total[name] / self.calls[name] * 1e6,
+            }
+            for name in self.total
+        }
+
+
+class ScaledLevel:
+    """Временно растягивает уровень и число его платформ в `scale` раз"""
+
+    def __init__(self, level, scale):
+        self.level = level
+        self.scale = scale
+
+    def __enter__(self):
+        self.saved = (main.LEVEL_RANGES[self.level], main.LEVEL_PLATFORM_COUNTS[self.level])
+        start, end = self.saved[0]
+        main.LEVEL_RANGES[self.level] = (start, start + (end - start) * self.scale)
+        main.LEVEL_PLATFORM_COUNTS[self.level] = self.saved[1] * self.scale
+        return self
+
+    def __exit__(self, *exc):
+        main.LEVEL_RANGES[self.level], main.LEVEL_PLATFORM_COUNTS[self.level] = self.saved
+
+
+def scripted_input(world, tick):
+    """Скриптованный ввод: бег вправо с прыжками и короткими шагами назад"""
+    phase = tick % 240
+    if phase == 0:
+        world.move_right()
+    elif phase == 200:
+        world.stop_right()
+        world.move_left()
+    elif phase == 220:
+        world.stop_left()
+    if tick % 15 == 0:
+        world.jump()
+
+
+def rewind_at_level_end(world, level):
+    """Возвращает игрока в начало уровня, пока трасса не ушла на следующий"""
+    start, end = main.LEVEL_RANGES[level]
+    if world.player_sprite.center_x < end - REWIND_MARGIN:
+        return False
+    world._restart_level(start)
+    return True
+
+
+def level_letter_queue(level):
+    """Исходная очередь букв уровня - генератор работает с ее копией"""
+    return main.GameWorld()._letter_queue(level)
+
+
+def bench_generation(level, rounds):
+    """Чистая генерация раскладки уровня"""
+    timings = Timings()
+    queue = level_letter_queue(level)
+    start = time.perf_counter()
+    for i in range(rounds):
+        generator = main.LevelGenerator(level, BENCHMARK_SEED + i, queue)
+        for name in GENERATOR_FUNCTIONS:
+            timings.wrap(generator, name)
+        generator.generate(main.LEVEL_PLATFORM_COUNTS[level])
+    elapsed = time.perf_counter() - start
+    return {"layout_ms": elapsed / rounds * 1000, "functions": timings.report()}
+
+
+def wait_for_prefetch(world):
+    """Дожидается фоновой генерации, чтобы она не мешала замерам"""
+    for future in world.prefetched_layouts.values():
+        future.result()
+    world.prefetched_layouts.clear()
+
+
+def bench_world(level, ticks):
+    """Построение уровня и прогон симуляции со скриптованным вводом"""
+    # Текстуры игра рисует при запуске - в замеры их создание не входит
+    main.preload_textures()
+    world = main.GameWorld(seed=BENCHMARK_SEED)
+    world.setup()
+    while world.is_loading:
+        world.update(1 / 60)
+    wait_for_prefetch(world)
+
+    timings = Timings()
+    for name in WORLD_FUNCTIONS:
+        timings.wrap(world, name)
+
+    start = time.perf_counter()
+    if level > 1:
+        world._enter_level(level)
+        while world.is_loading:
+            world.update(1 / 60)
+    build_ms = (time.perf_counter() - start) * 1000
+    wait_for_prefetch(world)
+    layout = world.layout
+    counts = {
+        "walls": len(layout.platforms) + len(main.level_start_platforms(level)),
+        "coins": len(layout.coins),
+        "letters": len(layout.letters),
+        "spikes": len(layout.spikes),
+        # Спрайтов построено только для чанков рядом с игроком
+        "loaded": (len(world.wall_list) + len(world.coins_list)
+                   + len(world.letters_list) + len(world.spikes_list)),
+    }
+
+    # Время сборки уровня не смешиваем с шагами симуляции
+    timings.total.pop("update", None)
+    timings.calls.pop("update", None)
+
+    # Замеряются только тики; рестарт в начале уровня в замер не входит
+    elapsed = 0.0
+    rewinds = 0
+    perf_counter = time.perf_counter
+    for tick in range(ticks):
+        rewinds += rewind_at_level_end(world, level)
+        start = perf_counter()
+        scripted_input(world, tick)
+        world.update(1 / 60)
+        elapsed += perf_counter() - start
+    assert world.current_level == level, f"трасса ушла с уровня {level} на {world.current_level}"
+
+    return {
+        "build_ms": build_ms,
+        "ticks_per_second": ticks / elapsed,
+        "rewinds": rewinds,
+        **counts,
+        "functions": timings.report(),
+    }
+
+
+def run(ticks, rounds, only=None):
+    results = {}
+    for name, level, scale in SCENARIOS:
+        if only and name not in only:
+            continue
+        # Отдельные кэш раскладок и база словаря: замер не зависит от прошлых
+        # запусков, а собранные слова не попадают в прогресс игрока
+        with tempfile.TemporaryDirectory() as cache_dir:
+            main.LAYOUT_CACHE_DIR = cache_dir
+            main.VOCABULARY_DB_PATH = os.path.join(cache_dir, "vocabulary.sqlite3")
+            main.SEED_LOG_PATH = os.path.join(cache_dir, "seeds.log")
+            with ScaledLevel(level, scale):
+                results[name] = {
+                    "generation": bench_generation(level, rounds),
+                    "world": bench_world(level, ticks),
+                }
+        print_scenario(name, results[name])
+    return results
+
+
+def print_scenario(name, result):
+    world = result["world"]
+    print(f"\n== {name}: стен {world['walls']}, монет {world['coins']}, "
+          f"букв {world['letters']}, шипов {world['spikes']}, "
+          f"построено спрайтов {world['loaded']}")
+    print(f"   генерация раскладки: {result['generation']['layout_ms']:.2f} мс, "
+          f"сборка уровня: {world['build_ms']:.2f} мс, "
+          f"тиков в секунду: {world['ticks_per_second']:.0f}, "
+          f"возвратов в начало: {world['rewinds']}")
+    functions = dict(result["generation"]["functions"])
+    functions.update(world["functions"])
+    for func_name, stats in functions.items():
+        print(f"   {func_name:28s} {stats['calls']:7d} вызовов {stats['mean_us']:10.1f} мкс/вызов")
+
+
+def compare(results, baseline, threshold):
+    """Сравнение с сохраненной базой; возвращает число регрессий"""
+    regressions = 0
+    print("\n== Сравнение с базой")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        pairs = [("ticks_per_second", base["world"]["ticks_per_second"],
+                  result["world"]["ticks_per_second"], True)]
+        for section in ("generation", "world"):
+            for func_name, stats in result[section]["functions"].items():
+                if func_name in base[section]["functions"]:
+                    pairs.append((func_name, base[section]["functions"][func_name]["mean_us"],
+                                  stats["mean_us"], False))
+        for metric, old, new, higher_is_better in pairs:
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            mark = "РЕГРЕССИЯ" if worse > threshold else ""
+            regressions += bool(mark)
+            print(f"   {name:12s} {metric:28s} {old:12.1f} -> {new:12.1f} ({change:+.0%}) {mark}")
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="шагов симуляции на сценарий")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_GENERATION_ROUNDS, help="повторов генерации")
+    parser.add_argument("--scenario", action="append", help="запустить только этот сценарий")
+    parser.add_argument("--save-baseline", metavar="PATH", help="сохранить результаты как базу")
+    parser.add_argument("--baseline", metavar="PATH", help="сравнить с сохраненной базой")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="допустимое ухудшение, доля (по умолчанию 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run(args.ticks, args.rounds, args.scenario)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nБаза сохранена: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -4,9 +4,22 @@ import os
 os.environ['ARCADE_OPENGL_VERSION'] = '3.2'
 # Отключаем использование специального окна для отладки OpenGL
 os.environ['PYGLET_SHADOW_WINDOW'] = '0'
+import bisect
+import collections
+import concurrent.futures
+import csv
+import heapq
+import math
 import random
+import sqlite3
+import struct
 import time
 import sys
+import zlib
+import pyglet.graphics
+from arcade.clock import GLOBAL_FIXED_CLOCK
+from arcade.geometry import are_polygons_intersecting
+from PIL import Image, ImageDraw, ImageFont
 
 # --------------------------------
 # Конфигурация
@@ -43,6 +56,64 @@ LEVEL_4_END = 28000
 LEVEL_5_START = 28050
 LEVEL_5_END = 35000
 
+# Детерминированная генерация: ENGLISH_PLATFORMER_SEED повторяет уровни прошлой сессии
+# и включает кэш раскладок. Без него зерно выбирается случайно на каждую сессию
+LEVEL_SEED = None
+try:
+    LEVEL_SEED = int(os.environ["ENGLISH_PLATFORMER_SEED"]) & 0xFFFFFFFF
+except KeyError:
+    pass
+except ValueError:
+    print(f"[SEED] ENGLISH_PLATFORMER_SEED должно быть целым числом: {os.environ['ENGLISH_PLATFORMER_SEED']!r}")
+GENERATOR_VERSION = 2  # Увеличивать при любом изменении генератора уровней
+
+PLATFORM_COLORS = [
+    arcade.color.DARK_GREEN, arcade.color.OLIVE,
+    arcade.color.DARK_ORANGE, arcade.color.DARK_CERULEAN,
+    arcade.color.DARK_RED, arcade.color.DARK_VIOLET
+]
+
+# Шаг симуляции фиксирован: скорости, гравитация и таймеры заданы на один тик
+SIMULATION_RATE = 1 / 60
+MAX_SIMULATION_STEPS_PER_FRAME = 5  # Чтобы медленный кадр не вызывал лавину шагов
+RENDER_RATE = 1 / 60  # На слабых машинах можно снизить до 1 / 30
+
+# Сколько времени за кадр можно тратить на генерацию во время загрузки
+LOADING_FRAME_BUDGET = 0.012  # секунд
+
+# Оверлей производительности (F3)
+PERF_HISTORY_FRAMES = 240  # кадров в графике и процентилях
+PERF_TEXT_INTERVAL = 0.25  # секунд между обновлениями цифр
+PERF_GRAPH_MAX_MS = 40  # время кадра, соответствующее полной высоте графика
+
+# Границы генерации уровней: (начало, конец)
+LEVEL_RANGES = {
+    1: (0, LEVEL_1_END - 500),
+    2: (LEVEL_2_START, LEVEL_2_END),
+    3: (LEVEL_3_START, LEVEL_3_END),
+    4: (LEVEL_4_START, LEVEL_4_END),
+    5: (LEVEL_5_START, WORLD_BOUNDARY),
+}
+
+# Сколько платформ генерировать на каждом уровне
+LEVEL_PLATFORM_COUNTS = {
+    1: 40,  # Уровень 1: 5000px / 150px = ~33 + запас
+    2: 60,  # Уровень 2: 7950px / 150px = ~53 + запас
+    3: 50,  # Уровень 3: 6950px / 150px = ~46 + запас
+    4: 50,  # Уровень 4: 7950px / 150px = ~53 + запас
+    5: 50,  # Уровень 5: 6950px / 150px = ~46 + запас
+}
+
+# Интервальное повторение слов: сколько слов выдается уровню и сколько в них
+# может быть букв. Слово, которому не хватило платформ, с уровня снимается
+LEVEL_WORD_COUNTS = {1: 2, 2: 3, 3: 3, 4: 3, 5: 3}
+LEVEL_LETTER_LIMITS = {1: 10, 2: 19, 3: 16, 4: 20, 5: 16}
+PLAYER_PROFILE = os.environ.get("ENGLISH_PLATFORMER_PROFILE", "default")
+REVIEW_FIRST_INTERVAL = 24 * 60 * 60  # секунд до первого повторения собранного слова
+REVIEW_LAPSE_INTERVAL = 10 * 60  # несобранное слово возвращается через 10 минут
+REVIEW_START_EASE = 2.5
+REVIEW_MIN_EASE = 1.3
+
 # Механика смерти от падения
 FALL_DEATH_THRESHOLD = int(SCREEN_HEIGHT * 0.7)  # 80% высоты экрана
 
@@ -53,6 +124,14 @@ SPIKES_MAX_COUNT = 6
 SPIKE_WIDTH = 40
 SPIKE_HEIGHT = 40
 
+# Потоковый мир: спрайты строятся только для чанков рядом с игроком и камерой
+CHUNK_WIDTH = 1000
+CHUNK_LOAD_AHEAD = SCREEN_WIDTH  # px впереди, которые должны быть построены
+CHUNK_EVICT_BEHIND = SCREEN_WIDTH  # px позади, после которых чанк выгружается
+
+# Сетка для поиска монет и букв рядом с игроком (не меньше радиуса подбора)
+PICKUP_CELL_SIZE = 128
+
 if getattr(sys, 'frozen', False):
     # Режим EXE
     if hasattr(sys, '_MEIPASS'):
@@ -73,26 +152,99 @@ IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
 PLAYER_IMAGE_PATH = os.path.join(IMAGES_DIR, "player.png")
 BACKGROUND_IMAGE_PATH = os.path.join(IMAGES_DIR, "background.png")
 
+# Кэш сгенерированных уровней пишем в домашнюю папку (рядом с EXE может не быть прав).
+# Он ведется только при заданном зерне - со случайными зернами файлы не пригодятся
+LAYOUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".english_platformer", "layouts")
+# Зерна сыгранных сессий - чтобы повторить понравившиеся уровни
+SEED_LOG_PATH = os.path.join(os.path.expanduser("~"), ".english_platformer", "seeds.log")
+
+# Словарь: исходник в assets, индексированная база - рядом с кэшем уровней
+VOCABULARY_SOURCE_PATH = os.path.join(ASSETS_DIR, "vocabulary.csv")
+VOCABULARY_DB_PATH = os.path.join(os.path.expanduser("~"), ".english_platformer", "vocabulary.sqlite3")
+
 print(f"PLAYER_IMAGE_PATH: {PLAYER_IMAGE_PATH}")
 print(f"Exists: {os.path.exists(PLAYER_IMAGE_PATH)}")
 
-class Platform(arcade.Sprite):
-    """Класс платформы для оптимизации"""
+# Текстуры рисуются через PIL один раз и делятся между всеми спрайтами -
+# OpenGL для этого не нужен, поэтому мир по-прежнему работает без окна
+_textures = {}
+
+
+def spike_texture():
+    """Черный треугольник шипа с темно-красной обводкой"""
+    if "spike" not in _textures:
+        image = Image.new("RGBA", (SPIKE_WIDTH, SPIKE_HEIGHT), (0, 0, 0, 0))
+        points = [(SPIKE_WIDTH / 2, 0), (0, SPIKE_HEIGHT - 1), (SPIKE_WIDTH - 1, SPIKE_HEIGHT - 1)]
+        ImageDraw.Draw(image).polygon(points, fill=tuple(arcade.color.BLACK),
+                                      outline=tuple(arcade.color.DARK_RED), width=2)
+        _textures["spike"] = arcade.Texture(image, hash="spike")
+    return _textures["spike"]
+
+
+def _disc_image(radius, fill, outline=None, outline_width=0):
+    """Круг со сглаживанием: рисуем в 4 раза крупнее и уменьшаем"""
+    scale = 4
+    size = radius * 2 * scale
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(image).ellipse(
+        (0, 0, size - 1, size - 1), fill=tuple(fill),
+        outline=tuple(outline) if outline else None, width=outline_width * scale
+    )
+    return image.resize((radius * 2, radius * 2), Image.LANCZOS)
+
+
+def coin_texture():
+    """Золотая монетка"""
+    if "coin" not in _textures:
+        _textures["coin"] = arcade.Texture(_disc_image(15, arcade.color.GOLD), hash="coin")
+    return _textures["coin"]
+
+
+def letter_texture(letter):
+    """Значок буквы: голубой круг с темно-синей обводкой и заглавной буквой"""
+    key = f"letter_{letter}"
+    if key not in _textures:
+        image = _disc_image(20, arcade.color.LIGHT_BLUE, arcade.color.DARK_BLUE, 2)
+        try:
+            font = ImageFont.load_default(size=24)
+        except Exception as e:
+            print(f"Ошибка загрузки шрифта для букв: {e}")
+            font = ImageFont.load_default()
+        ImageDraw.Draw(image).text((20, 20), letter.upper(), fill=tuple(arcade.color.BLACK),
+                                   font=font, anchor="mm")
+        _textures[key] = arcade.Texture(image, hash=key)
+    return _textures[key]
+
+
+def preload_textures():
+    """Рисует текстуры монетки, шипа и всех букв заранее, до начала игры"""
+    spike_texture()
+    coin_texture()
+    for letter in "abcdefghijklmnopqrstuvwxyz":
+        letter_texture(letter)
+
+
+class Platform(arcade.SpriteSolidColor):
+    """Класс платформы для оптимизации
+
+    Один спрайт служит и стеной для физики, и картинкой: цветная
+    текстура позволяет рисовать все платформы уровня одним вызовом
+    wall_list.draw()
+    """
 
     def __init__(self, x, y, width, height, color):
-        super().__init__()
-        self.center_x = x
-        self.center_y = y
-        self.width = width
-        self.height = height
-        self.color = color
+        super().__init__(width, height, x, y, color)
 
 
 class Coin(arcade.Sprite):
     """Класс монетки"""
 
     def __init__(self, x, y):
-        super().__init__()
+        super().__init__(coin_texture())
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Готовит монетку к повторному использованию из пула"""
         self.center_x = x
         self.center_y = y
         self.collected = False
@@ -103,6 +255,11 @@ class Letter(arcade.Sprite):
 
     def __init__(self, x, y, letter, word):
         super().__init__()
+        self.reset(x, y, letter, word)
+
+    def reset(self, x, y, letter, word):
+        """Готовит букву к повторному использованию из пула"""
+        self.texture = letter_texture(letter)
         self.center_x = x
         self.center_y = y
         self.letter = letter
@@ -111,38 +268,1242 @@ class Letter(arcade.Sprite):
 
 
 class Spike(arcade.Sprite):
-    """Класс шипа"""
+    """Класс шипа
+
+    Все шипы делят одну готовую текстуру, поэтому рисуются
+    одним вызовом spikes_list.draw()
+    """
 
     def __init__(self, x, y):
-        super().__init__()
+        super().__init__(spike_texture())
         self.center_x = x
         self.center_y = y
-        self.width = SPIKE_WIDTH
-        self.height = SPIKE_HEIGHT
 
 
-class MyGame(arcade.Window):
-    def __init__(self, width, height, title):
-        super().__init__(width, height, title)
+class PlatformIndex:
+    """Индекс платформ, отсортированный по левому краю
+
+    Проверка пересечений смотрит только соседей в окне
+    PLATFORM_MAX_WIDTH + зазор, а не все стены уровня.
+    Более широкие объекты (пол уровня) хранятся отдельно.
+    """
+
+    def __init__(self, max_width=PLATFORM_MAX_WIDTH):
+        self.max_width = max_width
+        self.lefts = []
+        self.entries = []
+        self.wide = []
+
+    def add(self, center_x, width, y):
+        """Добавляет платформу в индекс"""
+        left = center_x - width // 2
+        right = center_x + width // 2
+        if width > self.max_width:
+            self.wide.append((left, right, y))
+            return
+        i = bisect.bisect_right(self.lefts, left)
+        self.lefts.insert(i, left)
+        self.entries.insert(i, (left, right, y))
+
+    def intersects(self, left, right, y, clearance, min_vertical_separation):
+        """Есть ли платформа ближе допустимого зазора"""
+        start = bisect.bisect_left(self.lefts, left - clearance - self.max_width)
+        end = bisect.bisect_right(self.lefts, right + clearance)
+        for candidates in (self.entries[start:end], self.wide):
+            for wall_left, wall_right, wall_y in candidates:
+                horizontal_overlap = not (
+                        right + clearance < wall_left or
+                        left - clearance > wall_right
+                )
+                if horizontal_overlap and abs(y - wall_y) < min_vertical_separation:
+                    return True
+        return False
+
+
+class SortedXIndex:
+    """Спрайты, отсортированные по center_x, с выборкой окна через bisect
+
+    Индекс пересобирается лениво - при первом запросе после изменения списка.
+    """
+
+    def __init__(self, sprite_list):
+        self.sprite_list = sprite_list
+        self.sprites = []
+        self.xs = []
+        self.dirty = True
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def query(self, left, right):
+        """Спрайты с left <= center_x <= right"""
+        if self.dirty:
+            self.sprites = sorted(self.sprite_list, key=lambda sprite: sprite.center_x)
+            self.xs = [sprite.center_x for sprite in self.sprites]
+            self.dirty = False
+        start = bisect.bisect_left(self.xs, left)
+        end = bisect.bisect_right(self.xs, right)
+        return self.sprites[start:end]
+
+
+class PickupGrid:
+    """Грубая фаза для подбираемых объектов: ячейки сетки по координатам
+
+    Собранные объекты удаляются из сетки, поэтому проверка подбора
+    перебирает только несколько объектов рядом с игроком.
+    """
+
+    def __init__(self, cell_size=PICKUP_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, sprite):
+        key = self._cell(sprite.center_x, sprite.center_y)
+        self.cells.setdefault(key, []).append(sprite)
+
+    def remove(self, sprite):
+        key = self._cell(sprite.center_x, sprite.center_y)
+        cell = self.cells.get(key)
+        if cell and sprite in cell:
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[key]
+
+    def clear(self):
+        self.cells.clear()
+
+    def near(self, x, y):
+        """Объекты из ячейки точки и восьми соседних"""
+        cx, cy = self._cell(x, y)
+        result = []
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                cell = self.cells.get((i, j))
+                if cell:
+                    result.extend(cell)
+        return result
+
+
+class SpritePool:
+    """Пул спрайтов одного типа
+
+    Монеты и буквы уходящего уровня возвращаются сюда и переиспользуются
+    при постройке следующего вместо создания новых объектов.
+    """
+
+    def __init__(self, sprite_class):
+        self.sprite_class = sprite_class
+        self.free = []
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            return sprite
+        return self.sprite_class(*args)
+
+    def release(self, sprites):
+        self.free.extend(sprites)
+
+
+class StaticPlatformPhysics:
+    """Физика платформера arcade для неподвижных стен с поиском соседей через bisect"""
+
+    def __init__(self, gravity_constant, max_width=PLATFORM_MAX_WIDTH):
+        self.gravity_constant = gravity_constant
+        self.max_width = max_width
+        self.player_sprite = None
+        self.lefts = []
+        self.walls = []  # (left, right, bottom, top, sprite, точки хит-бокса), по возрастанию left
+        self.wide = []  # Стены шире max_width (пол уровня)
+
+        # Опора после последнего шага: спрайт стены под игроком или None
+        self.ground = None
+        self.landed = False  # На последнем шаге игрок приземлился
+
+    def clear(self):
+        self.lefts.clear()
+        self.walls.clear()
+        self.wide.clear()
+        self.ground = None
+        self.landed = False
+
+    def add_wall(self, sprite):
+        points = sprite.hit_box.get_adjusted_points()
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        wall = (min(xs), max(xs), min(ys), max(ys), sprite, points)
+        if sprite.width > self.max_width:
+            self.wide.append(wall)
+            return
+        index = bisect.bisect_right(self.lefts, wall[0])
+        self.lefts.insert(index, wall[0])
+        self.walls.insert(index, wall)
+
+    def remove_wall(self, sprite):
+        if sprite.width > self.max_width:
+            self.wide = [wall for wall in self.wide if wall[4] is not sprite]
+            return
+        index = bisect.bisect_left(self.lefts, min(point[0] for point in sprite.hit_box.get_adjusted_points()))
+        while self.walls[index][4] is not sprite:
+            index += 1
+        del self.lefts[index]
+        del self.walls[index]
+
+    def _walls_near(self, left, right):
+        """Стены, пересекающие полосу [left, right] по X"""
+        start = bisect.bisect_left(self.lefts, left - self.max_width)
+        end = bisect.bisect_right(self.lefts, right)
+        near = [wall for wall in self.walls[start:end] if wall[1] > left]
+        near.extend(wall for wall in self.wide if wall[0] < right and wall[1] > left)
+        return near
+
+    def _player_shape(self):
+        """Точки хит-бокса игрока относительно центра и их границы"""
+        scale_x, scale_y = self.player_sprite.hit_box.scale
+        shape = [(x * scale_x, y * scale_y) for x, y in self.player_sprite.hit_box.points]
+        xs = [point[0] for point in shape]
+        ys = [point[1] for point in shape]
+        return shape, (min(xs), max(xs), min(ys), max(ys))
+
+    @staticmethod
+    def _colliding(walls, shape, bounds, x, y):
+        """Стены, которые пересекает хит-бокс игрока с центром в (x, y)"""
+        # Границы отсекают ровно те стены, которые отсекла бы ось стены в многоугольной проверке
+        left, right, bottom, top = x + bounds[0], x + bounds[1], y + bounds[2], y + bounds[3]
+        hits = [wall for wall in walls
+                if left < wall[1] and right > wall[0] and bottom < wall[3] and top > wall[2]]
+        if hits:
+            points = [(px + x, py + y) for px, py in shape]
+            hits = [wall for wall in hits if are_polygons_intersecting(points, wall[5])]
+        return hits
+
+    def _wiggle_until_free(self, x, y, shape, bounds):
+        """Выталкивает игрока из стены в ближайшее свободное место, как arcade"""
+        distance = 1
+        while True:
+            walls = self._walls_near(x + bounds[0] - distance, x + bounds[1] + distance)
+            for tx, ty in ((x, y + distance), (x, y - distance), (x + distance, y), (x - distance, y),
+                           (x + distance, y + distance), (x + distance, y - distance),
+                           (x - distance, y + distance), (x - distance, y - distance)):
+                if not self._colliding(walls, shape, bounds, tx, ty):
+                    return tx, ty
+            distance *= 2
+
+    def can_jump(self, y_distance=5):
+        """Можно прыгать, если в y_distance под игроком есть опора"""
+        shape, bounds = self._player_shape()
+        x, y = self.player_sprite.position
+        walls = self._walls_near(x + bounds[0], x + bounds[1])
+        return bool(self._colliding(walls, shape, bounds, x, y - y_distance))
+
+    def update(self):
+        """Шаг физики игрока, как в arcade.PhysicsEnginePlatformer; возвращает стены, с которыми он столкнулся"""
+        player = self.player_sprite
+        player.change_y -= self.gravity_constant
+        shape, bounds = self._player_shape()
+
+        x, y = player.position
+        step = abs(player.change_x)
+        walls = self._walls_near(x + bounds[0] - step, x + bounds[1] + step)
+        if self._colliding(walls, shape, bounds, x, y):
+            x, y = self._wiggle_until_free(x, y, shape, bounds)
+            walls = self._walls_near(x + bounds[0] - step, x + bounds[1] + step)
+        original_x, original_y = x, y
+
+        # Шаг по Y: из потолка выходим вниз по пикселю, на опору поднимаемся по 0.25
+        dy = player.change_y
+        y += dy
+        was_grounded = self.ground is not None
+        self.ground = None
+        hit_list = self._colliding(walls, shape, bounds, x, y)
+        if hit_list:
+            if dy > 0:
+                while self._colliding(walls, shape, bounds, x, y):
+                    y -= 1
+            elif dy < 0:
+                for wall in hit_list:
+                    while self._colliding([wall], shape, bounds, x, y):
+                        y += 0.25
+                self.ground = max(hit_list, key=lambda wall: wall[3])[4]
+            player.change_y = 0.0
+        y = round(y, 2)
+        self.landed = self.ground is not None and not was_grounded
+
+        # Шаг по X: двоичный поиск допустимого сдвига с подъемом на ступеньку.
+        # Как и в arcade, после неудачной пробы подъема поиск идет с поднятым игроком
+        if player.change_x:
+            almost_original_y = y
+            direction = math.copysign(1, player.change_x)
+            cur_x_change = step
+            upper_bound = step
+            lower_bound = 0
+            cur_y_change = 0
+            probe_y = y
+            while True:
+                probe_x = original_x + cur_x_change * direction
+                collision = self._colliding(walls, shape, bounds, probe_x, probe_y)
+                hit_list.extend(wall for wall in collision if wall not in hit_list)
+                if collision:
+                    cur_y_change = cur_x_change
+                    probe_y = original_y + cur_y_change
+                    collision = self._colliding(walls, shape, bounds, probe_x, probe_y)
+                    if collision:
+                        cur_y_change -= cur_x_change
+                    else:
+                        while not collision and cur_y_change > 0:
+                            cur_y_change -= 1
+                            probe_y = almost_original_y + cur_y_change
+                            collision = self._colliding(walls, shape, bounds, probe_x, probe_y)
+                        cur_y_change += 1
+                        collision = []
+
+                    if not collision:
+                        break
+                    upper_bound = cur_x_change - 1
+                    if upper_bound - lower_bound <= 0:
+                        cur_x_change = lower_bound
+                        break
+                    cur_x_change = (upper_bound + lower_bound) // 2
+                else:
+                    lower_bound = cur_x_change
+                    if upper_bound - lower_bound <= 0:
+                        break
+                    cur_x_change = (upper_bound + lower_bound) // 2 + (upper_bound + lower_bound) % 2
+            x = original_x + cur_x_change * direction
+            y = almost_original_y + cur_y_change
+
+        player.position = (x, y)
+        return [wall[4] for wall in hit_list]
+
+
+class LevelLayout:
+    """Раскладка сгенерированного уровня: платформы, шипы, монеты и буквы
+
+    Хранится в компактном бинарном виде, ключ кэша - (уровень, зерно,
+    контрольная сумма очереди букв, версия генератора)
+    """
+
+    MAGIC = b"EPLL"
+    HEADER = struct.Struct("<4sHBIIIII")
+    PLATFORM = struct.Struct("<iiHB")
+    SPIKE = struct.Struct("<ii")
+    COIN = struct.Struct("<ff")
+    LETTER = struct.Struct("<ffBH")  # x, y, длины буквы и слова в UTF-8, затем их байты
+
+    def __init__(self, level, seed, words_key=0):
+        self.level = level
+        self.seed = seed
+        self.words_key = words_key
+        self.platforms = []  # (x, y, width, индекс цвета)
+        self.spikes = []  # (x, y)
+        self.coins = []  # (x, y)
+        self.letters = []  # (x, y, буква, слово)
+
+    @staticmethod
+    def cache_path(level, seed, words_key):
+        return os.path.join(LAYOUT_CACHE_DIR, f"level{level}_{seed}_{words_key:08x}_v{GENERATOR_VERSION}.bin")
+
+    def to_bytes(self):
+        """Сериализация в бинарный формат"""
+        parts = [self.HEADER.pack(
+            self.MAGIC, GENERATOR_VERSION, self.level, self.seed,
+            len(self.platforms), len(self.spikes), len(self.coins), len(self.letters)
+        )]
+        parts.extend(self.PLATFORM.pack(*platform) for platform in self.platforms)
+        parts.extend(self.SPIKE.pack(*spike) for spike in self.spikes)
+        parts.extend(self.COIN.pack(*coin) for coin in self.coins)
+        for x, y, letter, word in self.letters:
+            letter_bytes = letter.encode("utf-8")
+            word_bytes = word.encode("utf-8")
+            parts.append(self.LETTER.pack(x, y, len(letter_bytes), len(word_bytes)))
+            parts.append(letter_bytes)
+            parts.append(word_bytes)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Десериализация; None если данные не от этой версии генератора"""
+        magic, version, level, seed, n_platforms, n_spikes, n_coins, n_letters = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != GENERATOR_VERSION:
+            return None
+
+        layout = cls(level, seed)
+        offset = cls.HEADER.size
+        for _ in range(n_platforms):
+            layout.platforms.append(cls.PLATFORM.unpack_from(data, offset))
+            offset += cls.PLATFORM.size
+        for _ in range(n_spikes):
+            layout.spikes.append(cls.SPIKE.unpack_from(data, offset))
+            offset += cls.SPIKE.size
+        for _ in range(n_coins):
+            layout.coins.append(cls.COIN.unpack_from(data, offset))
+            offset += cls.COIN.size
+        for _ in range(n_letters):
+            x, y, letter_length, word_length = cls.LETTER.unpack_from(data, offset)
+            offset += cls.LETTER.size
+            letter = data[offset:offset + letter_length].decode("utf-8")
+            offset += letter_length
+            word = data[offset:offset + word_length].decode("utf-8")
+            offset += word_length
+            layout.letters.append((x, y, letter, word))
+        return layout
+
+    @classmethod
+    def load(cls, level, seed, words_key):
+        """Загрузка из кэша; None если раскладки нет или файл поврежден"""
+        try:
+            with open(cls.cache_path(level, seed, words_key), "rb") as f:
+                layout = cls.from_bytes(f.read())
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+        if layout is not None:
+            layout.words_key = words_key
+        return layout
+
+    def save(self):
+        """Запись в кэш; ошибки записи не мешают игре"""
+        try:
+            os.makedirs(LAYOUT_CACHE_DIR, exist_ok=True)
+            path = self.cache_path(self.level, self.seed, self.words_key)
+            with open(path + ".tmp", "wb") as f:
+                f.write(self.to_bytes())
+            os.replace(path + ".tmp", path)
+        except (OSError, struct.error) as e:
+            print(f"Не удалось сохранить кэш уровня: {e}")
+
+
+class LetterQueue:
+    """Очередь (слово, буква) уровня
+
+    Пары выдаются по одной прямо из списка слов, общий список букв
+    не строится. Позиция - это пара индексов (слово, буква), поэтому
+    рестарт уровня просто перематывает очередь назад.
+    """
+
+    def __init__(self, words, position=(0, 0)):
+        self.words = words
+        self.seek(position)
+
+    def seek(self, position):
+        """Переставляет очередь на позицию, сохраненную tell()"""
+        self.word_index, self.letter_index = position
+        self._skip_empty_words()
+
+    def tell(self):
+        return self.word_index, self.letter_index
+
+    def copy(self):
+        """Независимая очередь с той же позиции - для генератора"""
+        return LetterQueue(self.words, self.tell())
+
+    def _skip_empty_words(self):
+        while self.word_index < len(self.words) and self.letter_index >= len(self.words[self.word_index]):
+            self.word_index += 1
+            self.letter_index = 0
+
+    def __bool__(self):
+        return self.word_index < len(self.words)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.word_index >= len(self.words):
+            raise StopIteration
+        word = self.words[self.word_index]
+        letter = word[self.letter_index]
+        self.letter_index += 1
+        self._skip_empty_words()
+        return word, letter
+
+    def skip(self, count):
+        """Пропускает count пар, перескакивая целые слова"""
+        while count > 0 and self:
+            left = len(self.words[self.word_index]) - self.letter_index
+            if count < left:
+                self.letter_index += count
+                return
+            count -= left
+            self.word_index += 1
+            self.letter_index = 0
+            self._skip_empty_words()
+
+    def key(self):
+        """Контрольная сумма оставшихся пар - от нее зависит раскладка уровня"""
+        checksum = zlib.crc32(str(self.letter_index).encode("utf-8"))
+        for word in self.words[self.word_index:]:
+            checksum = zlib.crc32(word.encode("utf-8") + b"\n", checksum)
+        return checksum
+
+
+def level_start_platforms(level):
+    """Пол и первая платформа уровня: (x, y, width, height, color)"""
+    level_start, level_end = LEVEL_RANGES[level]
+    floor_width = level_end - level_start
+    floor = (level_start + floor_width // 2, 20, floor_width, 40, arcade.color.DARK_SLATE_GRAY)
+
+    if level == 1:
+        first = (200, 180, 160, 20, arcade.color.DARK_GREEN)
+    else:
+        first = (level_start + 200, 300 if level == 2 else 400, 160, 20, arcade.color.DARK_GREEN)
+    return [floor, first]
+
+
+class LevelGenerator:
+    """Генератор раскладки уровня
+
+    Работает только с данными, без спрайтов и OpenGL, поэтому
+    следующий уровень можно генерировать в фоновом потоке.
+    """
+
+    def __init__(self, level, seed, letter_queue):
+        self.current_level = level
+        self.rng = random.Random(seed)
+        self.layout = LevelLayout(level, seed, letter_queue.key())
+        self.letter_queue = letter_queue.copy()
+
+        self.platform_index = PlatformIndex()
+        for x, y, width, height, color in level_start_platforms(level):
+            self.platform_index.add(x, width, y)
+        # Генерация продолжается от правого края первой платформы
+        self.max_spawn_x = x + width // 2
+
+    def generate(self, platform_count):
+        """Генерирует заданное количество элементов мира целиком"""
+        for _ in range(platform_count):
+            self.spawn_world_elements()
+        return self.layout
+
+    def spawn_spikes_on_floor(self, start_x, count=None):
+        """Создает шипы с проверкой границ"""
+        if self.current_level not in [4, 5]:
+            return
+
+        if count is None:
+            count = self.rng.randint(SPIKES_MIN_COUNT, SPIKES_MAX_COUNT)
+
+        total_width = count * SPIKE_WIDTH
+
+        # Определяем границы уровня
+        level_end = LEVEL_RANGES[self.current_level][1]
+
+        # Проверяем, не выходят ли шипы за границу
+        if start_x + total_width > level_end - 100:  # Отступ 100px
+            return  # Не создаем
+
+        start_x = start_x + total_width // 2
+
+        for i in range(count):
+            spike_x = start_x + (i - count // 2) * SPIKE_WIDTH
+
+            # Проверка каждого шипа
+            if spike_x > level_end - 50:  # Отступ 50px
+                continue
+
+            self.layout.spikes.append((spike_x, 20 + SPIKE_HEIGHT))
+
+    def spawn_platform(self, start_x):
+        """Генерирует новую платформу"""
+        MAX_ATTEMPTS = 5
+        MIN_HORIZONTAL_CLEARANCE = 8
+        MIN_VERTICAL_SEPARATION = 40
+
+        for attempt in range(MAX_ATTEMPTS):
+            # Параметры зависят от уровня
+            if self.current_level == 2:
+                gap = self.rng.randint(150, 320)
+                width = self.rng.randint(60, 200)
+                y = self.rng.randint(180, 550)
+            elif self.current_level == 3 or self.current_level == 4 or self.current_level == 5:
+                gap = self.rng.randint(120, 280)
+                width = self.rng.randint(80, 220)
+                y = self.rng.randint(300, 600)
+            else:
+                gap = self.rng.randint(PLATFORM_MIN_GAP, PLATFORM_MAX_GAP)
+                width = self.rng.randint(PLATFORM_MIN_WIDTH, PLATFORM_MAX_WIDTH)
+                y = self.rng.randint(PLATFORM_MIN_Y, PLATFORM_MAX_Y)
+
+            platform_left = start_x + gap
+            platform_right = platform_left + width
+            platform_x = platform_left + width // 2
+
+            # Ограничиваем генерацию
+            if platform_right > LEVEL_RANGES[self.current_level][1]:
+                continue
+
+            # Проверяем пересечения только с соседями по индексу
+            intersects = self.platform_index.intersects(
+                platform_left, platform_right, y,
+                MIN_HORIZONTAL_CLEARANCE, MIN_VERTICAL_SEPARATION
+            )
+
+            if intersects:
+                continue
+
+            color_index = self.rng.randrange(len(PLATFORM_COLORS))
+
+            self.platform_index.add(platform_x, width, y)
+            self.layout.platforms.append((platform_x, y, width, color_index))
+
+            right_edge = platform_x + width // 2
+            if right_edge > self.max_spawn_x:
+                self.max_spawn_x = right_edge
+
+            # Добавляем шипы на четвертом и пятом уровнях
+            if self.current_level in [4, 5] and self.rng.random() < SPIKES_PROBABILITY:
+                self.spawn_spikes_on_floor(platform_x + width // 2 + 100)
+
+            return {"x": platform_x, "y": y, "width": width}
+
+        return None
+
+    def spawn_world_elements(self):
+        """Генерация элементов мира - сначала буквы, потом монетки"""
+        new_platform = self.spawn_platform(self.max_spawn_x)
+        if new_platform:
+            platform_width = new_platform["width"]
+            platform_x = new_platform["x"]
+            platform_y = new_platform["y"]
+
+            if self.letter_queue:
+                # БУКВА - 100% если есть в очереди
+                letter_offset = self.rng.uniform(-platform_width * 0.4, -platform_width * 0.1)
+                word, letter_char = next(self.letter_queue)
+                self.layout.letters.append((platform_x + letter_offset, platform_y + 30, letter_char, word))
+            else:
+                # МОНЕТКА - только если буквы закончились
+                coin_offset = self.rng.uniform(-platform_width * 0.4, platform_width * 0.4)
+                self.layout.coins.append((platform_x + coin_offset, platform_y + 30))
+
+
+def prepare_level(scheduler, level, seed, platform_count, words=None, use_cache=True):
+    """Фоновая подготовка уровня: слова от планировщика и раскладка
+
+    Возвращает (level_data, words, layout); level_data - кучи слов
+    уровня для WordScheduler.install или None, если слова выбраны заранее.
+    """
+    level_data = None
+    if words is None:
+        level_data, words = scheduler.prepare_level(level, LEVEL_WORD_COUNTS[level], LEVEL_LETTER_LIMITS[level])
+    queue = LetterQueue([word for word, translation in words])
+    return level_data, words, prepare_level_layout(level, seed, queue, platform_count, use_cache)
+
+
+def prepare_level_layout(level, seed, letter_queue, platform_count, use_cache=True):
+    """Берет раскладку уровня из кэша или генерирует и сохраняет ее"""
+    layout = LevelLayout.load(level, seed, letter_queue.key()) if use_cache else None
+    if layout is None:
+        layout = LevelGenerator(level, seed, letter_queue).generate(platform_count)
+        if use_cache:
+            layout.save()
+    return layout
+
+
+class Vocabulary:
+    """Словарь игры в SQLite
+
+    Слова лежат на диске с индексами по уровню, теме и самому слову.
+    База собирается из assets/vocabulary.csv при первом запуске и после
+    изменения CSV, а в память попадают только слова запрошенного уровня.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS words ("
+        "id INTEGER PRIMARY KEY, level INTEGER NOT NULL, topic TEXT NOT NULL, "
+        "word TEXT NOT NULL UNIQUE, translation TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS words_by_level ON words (level, id)",
+        "CREATE INDEX IF NOT EXISTS words_by_topic ON words (topic)",
+        # Прогресс игроков не зависит от пересборки словаря - ключ по самому слову
+        "CREATE TABLE IF NOT EXISTS reviews ("
+        "profile TEXT NOT NULL, word TEXT NOT NULL, due REAL NOT NULL, interval REAL NOT NULL, "
+        "ease REAL NOT NULL, reps INTEGER NOT NULL, PRIMARY KEY (profile, word)) WITHOUT ROWID",
+    )
+
+    def __init__(self, db_path=None, source_path=None):
+        # Пути читаются при создании, чтобы их можно было подменить (бенчмарк)
+        db_path = db_path or VOCABULARY_DB_PATH
+        self.source_path = source_path or VOCABULARY_SOURCE_PATH
+        self.db_path = db_path
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.connection = sqlite3.connect(db_path)
+            # Ответы пишутся посреди тика: журнал WAL без fsync на каждый коммит
+            # делает запись дешевой и не мешает фоновому потоку читать базу
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self._create_schema()
+        except (OSError, sqlite3.Error) as e:
+            # Нет прав на запись - словарь живет в памяти до конца сессии
+            print(f"Ошибка базы словаря {db_path}: {e}")
+            self.db_path = None
+            self.connection = sqlite3.connect(":memory:")
+            self._create_schema()
+        self._build_if_stale()
+
+    def _create_schema(self):
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+
+    def _build_if_stale(self):
+        """Пересобирает базу, если CSV изменился с прошлой сборки"""
+        try:
+            stat = os.stat(self.source_path)
+        except OSError as e:
+            print(f"Словарь {self.source_path} недоступен, используем собранную базу: {e}")
+            return
+        version = f"{stat.st_mtime_ns}:{stat.st_size}"
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        if row is not None and row[0] == version:
+            return
+
+        try:
+            rows = self._read_source()
+            with self.connection:
+                self.connection.execute("DELETE FROM words")
+                self.connection.executemany(
+                    "INSERT INTO words (level, topic, word, translation) VALUES (?, ?, ?, ?)", rows
+                )
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (version,))
+        except (OSError, ValueError, KeyError, csv.Error, sqlite3.Error) as e:
+            # Транзакция откатилась - играем со словами прошлой сборки
+            print(f"Не удалось собрать словарь из {self.source_path}: {e}")
+
+    def _read_source(self):
+        """Строки CSV для таблицы words; негодные слова и повторы пропускаются"""
+        rows = []
+        seen = set()
+        longest = max(LEVEL_LETTER_LIMITS.values())
+        with open(self.source_path, encoding="utf-8", newline="") as f:
+            for item in csv.DictReader(f):
+                word = item["word"].strip()
+                # Пустое слово или слово длиннее любого уровня собрать нельзя
+                if not word or len(word) > longest:
+                    print(f"Слово {word!r} пропущено: нужно от 1 до {longest} букв")
+                    continue
+                # Прогресс игрока хранится по слову - оно должно быть в словаре один раз
+                if word in seen:
+                    print(f"Слово {word!r} пропущено: уже есть в словаре")
+                    continue
+                seen.add(word)
+                rows.append((int(item["level"]), item["topic"], word, item["translation"]))
+        return rows
+
+    def connect(self):
+        """Отдельное соединение с базой на диске - для фонового потока"""
+        return sqlite3.connect(self.db_path)
+
+    def translations(self, words, connection=None):
+        """Переводы набора слов: {word: translation}"""
+        marks = ", ".join("?" * len(words))
+        return dict((connection or self.connection).execute(
+            f"SELECT word, translation FROM words WHERE word IN ({marks})", list(words)
+        ))
+
+
+class WordScheduler:
+    """Интервальное повторение слов профиля: кучи повторений и новых слов по уровням"""
+
+    # Сколько не влезших в лимит букв слов можно пропустить за один выбор
+    MAX_SKIPPED_WORDS = 32
+
+    def __init__(self, vocabulary, profile=None):
+        self.vocabulary = vocabulary
+        self.profile = profile or PLAYER_PROFILE
+        self.states = {}  # слово -> [due, interval, ease, reps] для слов с повторениями
+        self.heaps = {}  # уровень -> (куча (due, word), куча (id, word) новых слов, длина самого короткого слова)
+
+    def read_level(self, level, connection):
+        """Кучи и состояния слов уровня из базы: ((reviews, new, shortest), states)
+
+        Ничего не меняет в планировщике, поэтому может работать в любом потоке.
+        """
+        reviews, new, states = [], [], {}
+        shortest = None
+        rows = connection.execute(
+            "SELECT w.id, w.word, r.due, r.interval, r.ease, r.reps FROM words w "
+            "LEFT JOIN reviews r ON r.profile = ? AND r.word = w.word "
+            "WHERE w.level = ? ORDER BY w.id",
+            (self.profile, level),
+        )
+        for word_id, word, due, interval, ease, reps in rows:
+            if shortest is None or len(word) < shortest:
+                shortest = len(word)
+            if due is None:
+                new.append((word_id, word))
+            else:
+                states[word] = [due, interval, ease, reps]
+                reviews.append((due, word))
+        # Новые слова уже отсортированы по id - это готовая куча
+        heapq.heapify(reviews)
+        return (reviews, new, shortest or 0), states
+
+    def install(self, level, level_data):
+        """Принимает результат read_level; уже загруженный уровень не трогает"""
+        if level in self.heaps:
+            return
+        heaps, states = level_data
+        for word, state in states.items():
+            # Ответы этой сессии новее прочитанного из базы
+            self.states.setdefault(word, state)
+        self.heaps[level] = heaps
+
+    def _level_heaps(self, level):
+        """Кучи уровня - читаются из базы один раз за сессию"""
+        if level not in self.heaps:
+            self.install(level, self.read_level(level, self.vocabulary.connection))
+        return self.heaps[level]
+
+    @staticmethod
+    def _drop_stale(reviews, new, states):
+        """Снимает с вершин куч записи, которые устарели после ответов"""
+        while reviews and states[reviews[0][1]][0] != reviews[0][0]:
+            heapq.heappop(reviews)
+        while new and new[0][1] in states:
+            heapq.heappop(new)
+
+    def _pick(self, heaps, states, count, letter_limit, now):
+        """Выбор слов из куч уровня
+
+        Сначала просроченные повторения, затем новые слова, затем
+        повторения с ближайшим сроком. Слова, не влезающие в лимит букв,
+        пропускаются, но не больше MAX_SKIPPED_WORDS, и выбор
+        заканчивается, когда не влезет даже самое короткое слово уровня.
+        """
+        now = time.time() if now is None else now
+        reviews, new, shortest = heaps
+        picked, popped = [], []
+        letters = skipped = 0
+        while len(picked) < count and letter_limit - letters >= shortest and skipped < self.MAX_SKIPPED_WORDS:
+            self._drop_stale(reviews, new, states)
+            if reviews and (reviews[0][0] <= now or not new):
+                heap = reviews
+            elif new:
+                heap = new
+            else:
+                break
+            entry = heapq.heappop(heap)
+            popped.append((heap, entry))
+            word = entry[1]
+            if letters + len(word) <= letter_limit:
+                picked.append(word)
+                letters += len(word)
+            else:
+                skipped += 1
+
+        # Выбор ничего не меняет - возвращаем записи обратно в кучи
+        for heap, entry in popped:
+            heapq.heappush(heap, entry)
+        return picked
+
+    def _translate(self, words, connection):
+        if not words:
+            return []
+        translations = self.vocabulary.translations(words, connection)
+        return [(word, translations[word]) for word in words]
+
+    def next_words(self, level, count, letter_limit, now=None):
+        """Слова уровня, которые пора повторить: [(word, translation)]"""
+        words = self._pick(self._level_heaps(level), self.states, count, letter_limit, now)
+        return self._translate(words, self.vocabulary.connection)
+
+    def prepare_level(self, level, count, letter_limit, now=None):
+        """То же, что next_words, но для фонового потока: (level_data, words)
+
+        Читает базу через свое соединение и не меняет планировщик -
+        level_data главный поток потом передает в install.
+        """
+        connection = self.vocabulary.connect()
+        try:
+            level_data = self.read_level(level, connection)
+            words = self._pick(level_data[0], level_data[1], count, letter_limit, now)
+            return level_data, self._translate(words, connection)
+        finally:
+            connection.close()
+
+    def record(self, level, answers, now=None):
+        """Записывает ответы [(word, remembered)] по словам уровня и переносит сроки повторения"""
+        now = time.time() if now is None else now
+        rows = []
+        for word, remembered in answers:
+            due, interval, ease, reps = self.states.get(word, (0, 0, REVIEW_START_EASE, 0))
+            if remembered:
+                interval = REVIEW_FIRST_INTERVAL if reps == 0 else interval * ease
+                ease += 0.1
+                reps += 1
+            else:
+                interval = REVIEW_LAPSE_INTERVAL
+                ease = max(REVIEW_MIN_EASE, ease - 0.2)
+                reps = 0
+            due = now + interval
+            self.states[word] = [due, interval, ease, reps]
+            if level in self.heaps:
+                heapq.heappush(self.heaps[level][0], (due, word))
+            rows.append((self.profile, word, due, interval, ease, reps))
+
+        if not rows:
+            return
+        try:
+            with self.vocabulary.connection:
+                self.vocabulary.connection.executemany(
+                    "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            # Прогресс остается в памяти до конца сессии
+            print(f"Не удалось сохранить прогресс слов: {e}")
+
+
+class Hud:
+    """HUD на кэшированных arcade.Text
+
+    Текстовые объекты создаются один раз и рисуются одним батчем,
+    строка пересобирается только когда меняется отображаемое значение
+    """
+
+    def __init__(self):
+        self.batch = pyglet.graphics.Batch()
+        self._values = {}
+
+        bonus_x = SCREEN_WIDTH - 380
+        bonus_y = SCREEN_HEIGHT - 40
+        self.bonus_x = bonus_x
+        self.active_bonuses_y = bonus_y - 190
+
+        # Статичные надписи (ссылки держим, иначе pyglet уберет их из батча)
+        self.static_texts = [
+            self._make_text("← → : Двигаться    ↑/Пробел : Прыжок", 10, SCREEN_HEIGHT - 60, arcade.color.WHITE, 14),
+            self._make_text("ПОКУПКА БОНУСОВ:", bonus_x, bonus_y, arcade.color.GOLD, 18),
+            self._make_text("Клавиша 1 - Ускорение (2 монет)", bonus_x, bonus_y - 40, arcade.color.GREEN, 14),
+            self._make_text("Клавиша 2 - Усиление прыжка (3 монет)", bonus_x, bonus_y - 70, arcade.color.GREEN, 14),
+            self._make_text("Клавиша 3 - Щит (5 монет)", bonus_x, bonus_y - 100, arcade.color.GREEN, 14),
+        ]
+
+        # Динамические надписи
+        self.level_text = self._make_text("", 10, SCREEN_HEIGHT - 30, arcade.color.BLACK, 20)
+        self.coins_text = self._make_text("", 10, SCREEN_HEIGHT - 84, arcade.color.WHITE, 14)
+        self.letters_text = self._make_text("", 10, SCREEN_HEIGHT - 108, arcade.color.WHITE, 14)
+        self.shields_text = self._make_text("", bonus_x, bonus_y - 130, arcade.color.LIGHT_BLUE, 16)
+        self.speed_text = self._make_text("", bonus_x, self.active_bonuses_y, arcade.color.GREEN, 14)
+        self.jump_text = self._make_text("", bonus_x, self.active_bonuses_y, arcade.color.GREEN, 14)
+        self.bonus_message_text = self._make_text(
+            "", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, arcade.color.GREEN, 24,
+            align="center", anchor_x="center", anchor_y="center"
+        )
+        self.death_text = self._make_text(
+            "", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, arcade.color.RED, 36,
+            align="center", anchor_x="center", anchor_y="center"
+        )
+        self.word_texts = []
+
+    def _make_text(self, text, x, y, color, size, **kwargs):
+        """Создает текстовый объект в общем батче"""
+        return arcade.Text(text, x, y, color, size, batch=self.batch, **kwargs)
+
+    def _changed(self, key, value):
+        """Запоминает значение и сообщает, изменилось ли оно"""
+        if key in self._values and self._values[key] == value:
+            return False
+        self._values[key] = value
+        return True
+
+    def update(self, game):
+        """Обновляет только те надписи, чьи значения изменились"""
+        if self._changed("level", game.current_level):
+            self.level_text.text = f"Уровень: {game.current_level}"
+        if self._changed("coins", game.coins_collected):
+            self.coins_text.text = f"Монеты: {game.coins_collected}"
+        if self._changed("letters", len(game.collected_letters)):
+            self.letters_text.text = f"Собрано букв: {len(game.collected_letters)}"
+        if self._changed("shields", game.shield_count):
+            self.shields_text.text = f"Щитов: {game.shield_count}"
+
+        # Активные бонусы
+        current_time = game.sim_time
+        active_bonuses_y = self.active_bonuses_y
+
+        speed_left = None
+        if game.speed_boost_active:
+            speed_left = max(0, int(game.speed_boost_end_time - current_time))
+        if self._changed("speed", speed_left):
+            self.speed_text.visible = speed_left is not None
+            if speed_left is not None:
+                self.speed_text.text = f"Ускорение: {speed_left}с"
+        if speed_left is not None:
+            active_bonuses_y -= 25
+
+        jump_left = None
+        if game.jump_boost_active:
+            jump_left = max(0, int(game.jump_boost_end_time - current_time))
+        if self._changed("jump", (jump_left, active_bonuses_y)):
+            self.jump_text.visible = jump_left is not None
+            self.jump_text.y = active_bonuses_y
+            if jump_left is not None:
+                self.jump_text.text = f"Прыжок усилен: {jump_left}с"
+
+        # Сообщение о покупке бонуса
+        bonus_message = game.bonus_purchase_message if game.bonus_message_timer > 0 else None
+        if self._changed("bonus_message", bonus_message):
+            self.bonus_message_text.visible = bonus_message is not None
+            if bonus_message is not None:
+                self.bonus_message_text.text = bonus_message
+
+        # Собранные слова
+        if self._changed("words", tuple(game.completed_words)):
+            y_offset = SCREEN_HEIGHT - 140
+            while len(self.word_texts) < len(game.completed_words):
+                i = len(self.word_texts)
+                self.word_texts.append(self._make_text("", 10, y_offset - i * 30, arcade.color.BLACK, 16))
+            for i, word_text in enumerate(self.word_texts):
+                if i < len(game.completed_words):
+                    word, translation = game.completed_words[i]
+                    word_text.text = f"{word} - {translation}"
+                    word_text.visible = True
+                else:
+                    word_text.visible = False
+
+        death_message = None
+        if game.show_death_message:
+            death_message = "СМЕРТЬ ОТ ШИПОВ!" if game.death_type == "spikes" else "СМЕРТЬ ОТ ПАДЕНИЯ!"
+        if self._changed("death", death_message):
+            self.death_text.visible = death_message is not None
+            if death_message is not None:
+                self.death_text.text = death_message
+
+    def draw(self):
+        """Отрисовка всего HUD одним батчем"""
+        self.batch.draw()
+
+
+class PerfOverlay:
+    """Оверлей производительности: время кадра, график, процентили и фазы
+
+    Пока оверлей выключен, замеров нет: методы мира оборачиваются
+    таймерами только при включении и снимаются при выключении, а
+    on_draw проверяет один флаг. Время отрисовки - это время CPU на
+    вызовы отрисовки, сама видеокарта работает асинхронно.
+    """
+
+    # (атрибут мира или None, метод, подпись) - фазы шага симуляции
+    UPDATE_PHASES = [
+        ("physics_engine", "update", "физика"),
+        (None, "_check_coin_collisions", "монеты"),
+        (None, "_check_letter_collisions", "буквы"),
+        (None, "check_spikes_collision", "шипы"),
+        (None, "check_fall_damage", "падение"),
+        (None, "_stream_chunks", "чанки"),
+    ]
+    DRAW_PHASES = ["фон", "платформы", "шипы", "монеты и буквы", "игрок", "HUD"]
+
+    WIDTH = 380
+    GRAPH_HEIGHT = 80
+
+    def __init__(self):
+        self.enabled = False
+        self.frame_times = collections.deque(maxlen=PERF_HISTORY_FRAMES)
+        self.update_totals = collections.defaultdict(float)  # фазы симуляции за кадр
+        self.draw_totals = collections.defaultdict(float)  # фазы отрисовки за кадр
+        self.update_means = {}
+        self.draw_means = {}
+        self.last_frame = None
+        self.lap_start = 0.0
+        self.next_text_time = 0.0
+        self._wrapped = []
+
+        self.left = SCREEN_WIDTH - self.WIDTH - 10
+        self.bottom = 10
+        rows = 3 + len(self.UPDATE_PHASES) + len(self.DRAW_PHASES)
+        self.height = self.GRAPH_HEIGHT + 16 * rows + 20
+        self.batch = pyglet.graphics.Batch()
+        self.lines = [
+            arcade.Text("", self.left + 8, self.bottom + self.height - 18 - 16 * i,
+                        arcade.color.WHITE, 10, batch=self.batch)
+            for i in range(rows)
+        ]
+
+    def toggle(self, world):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(world)
+
+    def enable(self, world):
+        """Оборачивает фазы симуляции таймерами и начинает сбор"""
+        for owner, name, label in self.UPDATE_PHASES:
+            self._wrap(getattr(world, owner) if owner else world, name, label)
+        self.frame_times.clear()
+        self.update_means.clear()
+        self.draw_means.clear()
+        self.last_frame = None
+        self.next_text_time = 0.0
+        self.enabled = True
+
+    def disable(self):
+        """Возвращает методам классов исходные версии без таймеров"""
+        for obj, name in self._wrapped:
+            delattr(obj, name)
+        self._wrapped = []
+        self.enabled = False
+
+    def _wrap(self, obj, name, label):
+        func = getattr(obj, name)
+        totals = self.update_totals
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[label] += perf_counter() - start
+
+        setattr(obj, name, timed)
+        self._wrapped.append((obj, name))
+
+    def begin_frame(self):
+        """Начало on_draw: время с прошлого кадра и старт замера фаз"""
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+        self.lap_start = now
+
+    def lap(self, label):
+        """Закрывает фазу отрисовки, начатую предыдущим lap или begin_frame"""
+        now = time.perf_counter()
+        self.draw_totals[label] += now - self.lap_start
+        self.lap_start = now
+
+    @staticmethod
+    def _smooth(means, totals):
+        """Переносит замеры кадра в скользящие средние и обнуляет их"""
+        for label, value in totals.items():
+            means[label] = means.get(label, value) * 0.9 + value * 0.1
+        totals.clear()
+
+    def _percentile(self, ordered, fraction):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    def _update_text(self, world):
+        lines = self.lines
+        if self.frame_times:
+            ordered = sorted(self.frame_times)
+            mean = sum(ordered) / len(ordered)
+            lines[0].text = (f"Кадр {mean * 1000:.1f} мс ({1 / mean:.0f} FPS)  "
+                             f"p50 {self._percentile(ordered, 0.5):.1f}  "
+                             f"p95 {self._percentile(ordered, 0.95):.1f}  "
+                             f"p99 {self._percentile(ordered, 0.99):.1f}")
+        else:
+            lines[0].text = "Кадр: нет данных"
+        lines[1].text = (f"Спрайты: стены {len(world.wall_list)}  монеты {len(world.coins_list)}  "
+                         f"буквы {len(world.letters_list)}  шипы {len(world.spikes_list)}")
+        layout = world.layout
+        if layout is not None:
+            lines[2].text = (f"Уровень: платформы {len(layout.platforms)}  монеты {len(layout.coins)}  "
+                             f"буквы {len(layout.letters)}  шипы {len(layout.spikes)}")
+
+        row = 3
+        for kind, labels, means in (("симуляция", [p[2] for p in self.UPDATE_PHASES], self.update_means),
+                                    ("отрисовка", self.DRAW_PHASES, self.draw_means)):
+            for label in labels:
+                lines[row].text = f"{kind}: {label} - {means.get(label, 0.0) * 1000:.3f} мс"
+                row += 1
+
+    def _draw_graph(self):
+        """График времени кадров: по вертикальной линии на кадр"""
+        base = self.bottom + 8
+        scale = self.GRAPH_HEIGHT / PERF_GRAPH_MAX_MS
+        step = (self.WIDTH - 16) / PERF_HISTORY_FRAMES
+        budget = RENDER_RATE * 1000
+        fast, slow = [], []
+        x = self.left + 8
+        for frame in self.frame_times:
+            ms = frame * 1000
+            top = base + min(ms * scale, self.GRAPH_HEIGHT)
+            (fast if ms <= budget * 1.1 else slow).extend(((x, base), (x, top)))
+            x += step
+        width = max(1.0, step)
+        if fast:
+            arcade.draw_lines(fast, arcade.color.GREEN, width)
+        if slow:
+            arcade.draw_lines(slow, arcade.color.RED, width)
+        budget_y = base + min(budget * scale, self.GRAPH_HEIGHT)
+        arcade.draw_line(self.left + 8, budget_y, self.left + self.WIDTH - 8, budget_y,
+                         arcade.color.YELLOW, 1)
+
+    def draw(self, world):
+        """Конец on_draw: усреднение фаз кадра и отрисовка панели"""
+        self._smooth(self.update_means, self.update_totals)
+        self._smooth(self.draw_means, self.draw_totals)
+
+        now = time.perf_counter()
+        if now >= self.next_text_time:
+            self.next_text_time = now + PERF_TEXT_INTERVAL
+            self._update_text(world)
+
+        arcade.draw_lrbt_rectangle_filled(
+            self.left, self.left + self.WIDTH, self.bottom, self.bottom + self.height,
+            (0, 0, 0, 170)
+        )
+        self._draw_graph()
+        self.batch.draw()
+
 
+class GameWorld:
+    """Состояние и логика игры без окна и OpenGL - MyGame только рисует мир"""
+
+    def __init__(self, seed=LEVEL_SEED, profile=None):
         # Списки спрайтов
         self.player_list = None
         self.wall_list = None
-        self.platform_visual_list = None
         self.coins_list = None
         self.letters_list = None
         self.spikes_list = None
-        self.background_list = None
+        self.spike_index = None
+        self.coin_grid = PickupGrid()
+        self.letter_grid = PickupGrid()
+        self.coin_pool = SpritePool(Coin)
+        self.letter_pool = SpritePool(Letter)
 
         # Игрок и физика
         self.player_sprite = None
-        self.physics_engine = None
+        self.physics_engine = StaticPlatformPhysics(GRAVITY)
+        self.floor_platform = None  # Пол уровня - падение на него смертельно
 
         # Камера
         self.camera_x = 0
 
+        # Время симуляции и состояние прошлого тика для интерполяции отрисовки
+        self.sim_time = 0.0
+        self.previous_camera_x = 0
+        self.previous_player_position = (0, 0)
+
         # Генерация мира
-        self.max_spawn_x = SCREEN_WIDTH
+        # Со случайным зерном раскладка вряд ли повторится - кэш на диске не ведем
+        self.use_layout_cache = seed is not None
+        self.base_seed = random.getrandbits(32) if seed is None else seed
+        self.level_seeds = {}
+        self.generator = None  # Пошаговая генерация в главном потоке
+        self.layout = None
+        self.layout_built = None
+        self.level_snapshot = None
+
+        # Чанки уровня: записи раскладки по чанкам и построенные спрайты
+        self.chunk_entries = {}  # номер чанка -> индексы записей раскладки
+        self.loaded_chunks = {}  # номер чанка -> спрайты чанка
+        self.streamed_range = None
+        self.collected_coin_ids = set()  # индексы собранных монет в раскладке
+        self.collected_letter_ids = set()
+
+        # Фоновая генерация следующего уровня
+        self.layout_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="level-generator"
+        )
+        self.prefetched_layouts = {}  # уровень -> Future с раскладкой
+        self.pending_layout = None
 
         # Статистика
         self.score = 0
@@ -155,7 +1516,7 @@ class MyGame(arcade.Window):
         self.has_shield_active = False  # Активен ли щит в данный момент
         self.speed_boost_active = False  # Активно ли ускорение
         self.jump_boost_active = False  # Активно ли усиление прыжка
-        self.speed_boost_end_time = 0  # Время окончания ускорения
+        self.speed_boost_end_time = 0  # Время окончания ускорения (по времени симуляции)
         self.jump_boost_end_time = 0  # Время окончания усиления прыжка
 
         # Цены бонусов
@@ -189,70 +1550,32 @@ class MyGame(arcade.Window):
         self.loading_progress = 0
         self.platforms_generated = 0
         self.total_platforms_to_generate = 50  # Сколько платформ сгенерировать заранее
+        self.loading_frame_budget = LOADING_FRAME_BUDGET
 
-        # Слова для изучения
-        self.words_to_collect = {
-            "cat": {"letters": ["c", "a", "t"], "translation": "кот", "collected": False, "progress": {}},
-            "dog": {"letters": ["d", "o", "g"], "translation": "собака", "collected": False, "progress": {}},
-            "mother": {"letters": ["m", "o", "t", "h", "e", "r"], "translation": "мама", "collected": False,
-                       "progress": {}},
-            "father": {"letters": ["f", "a", "t", "h", "e", "r"], "translation": "папа", "collected": False,
-                       "progress": {}},
-            "brother": {"letters": ["b", "r", "o", "t", "h", "e", "r"], "translation": "брат", "collected": False,
-                        "progress": {}},
-            "food": {"letters": ["f", "o", "o", "d"], "translation": "еда", "collected": False, "progress": {}},
-            "pizza": {"letters": ["p", "i", "z", "z", "a"], "translation": "пицца", "collected": False, "progress": {}},
-            "bread": {"letters": ["b", "r", "e", "a", "d"], "translation": "хлеб", "collected": False, "progress": {}},
-            "math": {"letters": ["m", "a", "t", "h"], "translation": "математика", "collected": False, "progress": {}},
-            "physics": {"letters": ["p", "h", "y", "s", "i", "c", "s"], "translation": "физика", "collected": False,
-                        "progress": {}},
-            "chemistry": {"letters": ["c", "h", "e", "m", "i", "s", "t", "r", "y"], "translation": "химия",
-                          "collected": False, "progress": {}},
-            "sofa": {"letters": ["s", "o", "f", "a"], "translation": "диван", "collected": False, "progress": {}},
-            "table": {"letters": ["t", "a", "b", "l", "e"], "translation": "стол", "collected": False, "progress": {}},
-            "chair": {"letters": ["c", "h", "a", "i", "r"], "translation": "стул", "collected": False, "progress": {}}
-        }
-
-        # Очереди букв
-        self.letter_queue_level1 = [
-            ("cat", "c"), ("cat", "a"), ("cat", "t"),
-            ("dog", "d"), ("dog", "o"), ("dog", "g"),
-        ]
-        self.letter_queue_level2 = [
-            ("mother", "m"), ("mother", "o"), ("mother", "t"), ("mother", "h"), ("mother", "e"), ("mother", "r"),
-            ("father", "f"), ("father", "a"), ("father", "t"), ("father", "h"), ("father", "e"), ("father", "r"),
-            ("brother", "b"), ("brother", "r"), ("brother", "o"), ("brother", "t"), ("brother", "h"), ("brother", "e"),
-            ("brother", "r"),
-        ]
-        self.letter_queue_level3 = [
-            ("food", "f"), ("food", "o"), ("food", "o"), ("food", "d"),
-            ("pizza", "p"), ("pizza", "i"), ("pizza", "z"), ("pizza", "z"), ("pizza", "a"),
-            ("bread", "b"), ("bread", "r"), ("bread", "e"), ("bread", "a"), ("bread", "d"),
-        ]
-        self.letter_queue_level4 = [
-            ("math", "m"), ("math", "a"), ("math", "t"), ("math", "h"),
-            ("physics", "p"), ("physics", "h"), ("physics", "y"), ("physics", "s"), ("physics", "i"), ("physics", "c"),
-            ("physics", "s"),
-            ("chemistry", "c"), ("chemistry", "h"), ("chemistry", "e"), ("chemistry", "m"), ("chemistry", "i"),
-            ("chemistry", "s"), ("chemistry", "t"), ("chemistry", "r"), ("chemistry", "y"),
-        ]
-        self.letter_queue_level5 = [
-            ("sofa", "s"), ("sofa", "o"), ("sofa", "f"), ("sofa", "a"),
-            ("table", "t"), ("table", "a"), ("table", "b"), ("table", "l"), ("table", "e"),
-            ("chair", "c"), ("chair", "h"), ("chair", "a"), ("chair", "i"), ("chair", "r"),
-        ]
-
-        arcade.set_background_color(arcade.color.SKY_BLUE)
+        # Слова для изучения - планировщик повторений выбирает их по уровням, по мере надобности
+        self.vocabulary = Vocabulary()
+        self.scheduler = WordScheduler(self.vocabulary, profile)
+        self.words_to_collect = {}
+        self.level_words = {}  # уровень -> слова уровня по порядку
+        self.letter_queues = {}  # уровень -> очередь (слово, буква) для генерации
 
     def setup(self):
         """Инициализация игры"""
         self.player_list = arcade.SpriteList()
         self.wall_list = arcade.SpriteList()
-        self.platform_visual_list = arcade.SpriteList()
+        self.physics_engine.clear()
         self.coins_list = arcade.SpriteList()
         self.letters_list = arcade.SpriteList()
         self.spikes_list = arcade.SpriteList()
-        self.background_list = arcade.SpriteList()
+
+        # Индексы по x для выборки видимых и ближних объектов
+        self.spike_index = SortedXIndex(self.spikes_list)
+        self.coin_grid = PickupGrid()
+        self.letter_grid = PickupGrid()
+        self.loaded_chunks = {}
+        self.streamed_range = None
+        self.collected_coin_ids = set()
+        self.collected_letter_ids = set()
 
         # Сбрасываем статистику
         self.score = 0
@@ -260,7 +1583,6 @@ class MyGame(arcade.Window):
         self.collected_letters = []
         self.completed_words = []
         self.camera_x = 0
-        self.max_spawn_x = SCREEN_WIDTH
         self.current_level = 1
 
         # Сбрасываем бонусы
@@ -287,69 +1609,12 @@ class MyGame(arcade.Window):
         self.loading_progress = 0
         self.platforms_generated = 0
 
-        # РЕАЛЬНОЕ количество платформ для каждого уровня
-        if self.current_level == 1:
-            self.total_platforms_to_generate = 40  # Уровень 1: 5000px / 150px = ~33 + запас
-        elif self.current_level == 2:
-            self.total_platforms_to_generate = 60  # Уровень 2: 7950px / 150px = ~53 + запас
-        elif self.current_level == 3:
-            self.total_platforms_to_generate = 50  # Уровень 3: 6950px / 150px = ~46 + запас
-        elif self.current_level == 4:
-            self.total_platforms_to_generate = 50  # Уровень 4: 7950px / 150px = ~53 + запас
-        elif self.current_level == 5:
-            self.total_platforms_to_generate = 50  # Уровень 5: 6950px / 150px = ~46 + запас
-
-        # Сбрасываем состояние слов
-        for word in self.words_to_collect:
-            self.words_to_collect[word]["collected"] = False
-            self.words_to_collect[word]["progress"] = {}
-            for letter in self.words_to_collect[word]["letters"]:
-                self.words_to_collect[word]["progress"][letter] = 0
-
-        # Сбрасываем очереди букв
-        self.letter_queue_level1 = [
-            ("cat", "c"), ("cat", "a"), ("cat", "t"),
-            ("dog", "d"), ("dog", "o"), ("dog", "g"),
-        ]
-        self.letter_queue_level2 = [
-            ("mother", "m"), ("mother", "o"), ("mother", "t"), ("mother", "h"), ("mother", "e"), ("mother", "r"),
-            ("father", "f"), ("father", "a"), ("father", "t"), ("father", "h"), ("father", "e"), ("father", "r"),
-            ("brother", "b"), ("brother", "r"), ("brother", "o"), ("brother", "t"), ("brother", "h"), ("brother", "e"),
-            ("brother", "r"),
-        ]
-        self.letter_queue_level3 = [
-            ("food", "f"), ("food", "o"), ("food", "o"), ("food", "d"),
-            ("pizza", "p"), ("pizza", "i"), ("pizza", "z"), ("pizza", "z"), ("pizza", "a"),
-            ("bread", "b"), ("bread", "r"), ("bread", "e"), ("bread", "a"), ("bread", "d"),
-        ]
-        self.letter_queue_level4 = [
-            ("math", "m"), ("math", "a"), ("math", "t"), ("math", "h"),
-            ("physics", "p"), ("physics", "h"), ("physics", "y"), ("physics", "s"), ("physics", "i"), ("physics", "c"),
-            ("physics", "s"),
-            ("chemistry", "c"), ("chemistry", "h"), ("chemistry", "e"), ("chemistry", "m"), ("chemistry", "i"),
-            ("chemistry", "s"), ("chemistry", "t"), ("chemistry", "r"), ("chemistry", "y"),
-        ]
-        self.letter_queue_level5 = [
-            ("sofa", "s"), ("sofa", "o"), ("sofa", "f"), ("sofa", "a"),
-            ("table", "t"), ("table", "a"), ("table", "b"), ("table", "l"), ("table", "e"),
-            ("chair", "c"), ("chair", "h"), ("chair", "a"), ("chair", "i"), ("chair", "r"),
-        ]
+        self.total_platforms_to_generate = LEVEL_PLATFORM_COUNTS[self.current_level]
 
-        # Загрузка фона
-        if os.path.exists(BACKGROUND_IMAGE_PATH):
-            try:
-                self.background_texture = arcade.load_texture(BACKGROUND_IMAGE_PATH)
-                self.background_sprite = arcade.Sprite()
-                self.background_sprite.texture = self.background_texture
-                self.background_sprite.center_x = SCREEN_WIDTH // 2
-                self.background_sprite.center_y = SCREEN_HEIGHT // 2
-                self.background_sprite.width = SCREEN_WIDTH
-                self.background_sprite.height = SCREEN_HEIGHT
-                self.background_list.append(self.background_sprite)
-            except Exception as e:
-                self.background_list = None
-        else:
-            self.background_list = None
+        # Сбрасываем слова и очереди букв - уровни загрузят их заново
+        self.words_to_collect = {}
+        self.level_words = {}
+        self.letter_queues = {}
 
         # Создаем игрока
         try:
@@ -363,392 +1628,377 @@ class MyGame(arcade.Window):
         self.player_sprite.center_x = 128
         self.player_sprite.center_y = 200
         self.player_list.append(self.player_sprite)
+        self.physics_engine.player_sprite = self.player_sprite
 
         # Создаем начальные платформы и объекты
         self.create_initial_platforms()
+        self._begin_level_layout()
 
-        # Физика
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        self.sim_time = 0.0
+        self._snap_interpolation()
 
     def create_initial_platforms(self):
         """Создает только минимальные стартовые платформы"""
-        if self.current_level == 1:
-            # Пол первого уровня
-            floor_end = LEVEL_1_END - 500
-            floor_center_x = floor_end // 2
-
-            # Физическая платформа
-            physics_sprite = arcade.SpriteSolidColor(floor_end, 40, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = floor_center_x
-            physics_sprite.center_y = 20
-            self.wall_list.append(physics_sprite)
-
-            # Визуальная платформа
-            platform_visual = Platform(floor_center_x, 20, floor_end, 40, arcade.color.DARK_SLATE_GRAY)
-            self.platform_visual_list.append(platform_visual)
-
-            # Стартовая платформа для игрока
-            start_x = 200
-            start_y = 180
-            start_width = 160
-
-            physics_sprite = arcade.SpriteSolidColor(start_width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = start_x
-            physics_sprite.center_y = start_y
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(start_x, start_y, start_width, 20, arcade.color.DARK_GREEN)
-            self.platform_visual_list.append(platform_visual)
+        floor, first = level_start_platforms(self.current_level)
+        self.floor_platform = self._add_platform(*floor)
+        self._add_platform(*first)
+
+    def _add_platform(self, x, y, width, height, color):
+        """Создает платформу - она же стена для физики"""
+        platform = Platform(x, y, width, height, color)
+        self.wall_list.append(platform)
+        self.physics_engine.add_wall(platform)
+        return platform
+
+    def _level_seed(self, level):
+        """Зерно генерации уровня - выводится из зерна сессии и записывается в журнал"""
+        if level not in self.level_seeds:
+            self.level_seeds[level] = (self.base_seed + level) & 0xFFFFFFFF
+            print(f"[SEED] Уровень {level}: {self.level_seeds[level]} (зерно сессии {self.base_seed})")
+            try:
+                os.makedirs(os.path.dirname(SEED_LOG_PATH), exist_ok=True)
+                with open(SEED_LOG_PATH, "a", encoding="utf-8") as log:
+                    log.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\tсессия {self.base_seed}"
+                              f"\tуровень {level}\tзерно {self.level_seeds[level]}\n")
+            except OSError as e:
+                print(f"[SEED] Не удалось записать журнал зерен: {e}")
+        return self.level_seeds[level]
+
+    def _begin_level_layout(self):
+        """Готовит раскладку текущего уровня
+
+        Порядок: уровень, заранее сгенерированный в фоне, затем кэш на диске,
+        и только потом пошаговая генерация в главном потоке во время загрузки.
+        """
+        level = self.current_level
+        seed = self._level_seed(level)
+        self.generator = None
+        # Пока раскладка не готова, от прошлого уровня не должно остаться ни записи
+        self.layout = None
+        self.layout_built = {"platforms": 0, "spikes": 0, "coins": 0, "letters": 0}
+        self.chunk_entries = {}
+        self.pending_layout = self.prefetched_layouts.pop(level, None)
+        if self.pending_layout is not None:
+            # Если фоновая генерация еще не закончилась, on_update дождется ее
+            if self.pending_layout.done():
+                self._use_pending_layout()
+            return
 
-            self.max_spawn_x = start_x + start_width // 2
+        cached = None
+        if self.use_layout_cache:
+            cached = LevelLayout.load(level, seed, self._current_letter_queue().key())
+        if cached is not None:
+            self._use_layout(cached)
+            return
 
-        elif self.current_level == 2:
-            # Пол второго уровня
-            floor_width = LEVEL_2_END - LEVEL_2_START
-            floor_center_x = LEVEL_2_START + floor_width // 2
+        self.generator = LevelGenerator(level, seed, self._current_letter_queue())
+        self.layout = self.generator.layout
 
-            # Пол
-            physics_sprite = arcade.SpriteSolidColor(floor_width, 40, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = floor_center_x
-            physics_sprite.center_y = 20
-            self.wall_list.append(physics_sprite)
+    def _use_pending_layout(self):
+        """Забирает результат фоновой генерации"""
+        future = self.pending_layout
+        self.pending_layout = None
+        try:
+            level_data, words, layout = future.result()
+        except Exception as e:
+            print(f"Ошибка фоновой генерации уровня: {e}")
+            self._begin_level_layout()
+            return
+        if level_data is not None:
+            self.scheduler.install(self.current_level, level_data)
+        self._set_level_words(self.current_level, words)
+        self._use_layout(layout)
+
+    def _use_layout(self, layout):
+        """Принимает готовую раскладку уровня целиком"""
+        self.layout = layout
+        self.layout_built = {"platforms": 0, "spikes": 0, "coins": 0, "letters": 0}
+        self.chunk_entries = {}
+        # Окно чанков могло быть записано, пока раскладки еще не было
+        self.streamed_range = None
+        self._index_layout_entries()
+        self.is_loading = False
+        self._level_ready()
+
+    def _index_layout_entries(self):
+        """Раскладывает еще не учтенные записи раскладки по чанкам
+
+        Спрайты здесь не создаются - их строит _stream_chunks
+        для чанков рядом с игроком и камерой.
+        """
+        layout = self.layout
+        built = self.layout_built
+
+        for kind in ("platforms", "spikes", "coins", "letters"):
+            entries = getattr(layout, kind)
+            for index in range(built[kind], len(entries)):
+                chunk_id = self._chunk_of(entries[index][0])
+                if chunk_id not in self.chunk_entries:
+                    self.chunk_entries[chunk_id] = {"platforms": [], "spikes": [], "coins": [], "letters": []}
+                self.chunk_entries[chunk_id][kind].append(index)
+
+        # Выложенные буквы убираем из очереди уровня
+        self._current_letter_queue().skip(len(layout.letters) - built["letters"])
+
+        built["platforms"] = len(layout.platforms)
+        built["spikes"] = len(layout.spikes)
+        built["coins"] = len(layout.coins)
+        built["letters"] = len(layout.letters)
+
+    @staticmethod
+    def _chunk_of(x):
+        return int(x // CHUNK_WIDTH)
+
+    def _stream_chunks(self):
+        """Строит чанки рядом с игроком и камерой и выгружает отставшие
+
+        Число спрайтов в списках ограничено окном вокруг игрока и камеры,
+        а не длиной уровня. Пока окно не сдвинулось на другой чанк,
+        вызов ничего не делает.
+        """
+        px = self.player_sprite.center_x
+        wanted = (
+            self._chunk_of(px - SCREEN_WIDTH / 2 - CHUNK_EVICT_BEHIND),
+            self._chunk_of(px + SCREEN_WIDTH / 2 + CHUNK_LOAD_AHEAD),
+            self._chunk_of(self.camera_x - CHUNK_EVICT_BEHIND),
+            self._chunk_of(self.camera_x + SCREEN_WIDTH + CHUNK_LOAD_AHEAD),
+        )
+        if wanted == self.streamed_range:
+            return
+        self.streamed_range = wanted
+
+        needed = set(range(wanted[0], wanted[1] + 1))
+        needed.update(range(wanted[2], wanted[3] + 1))
+        for chunk_id in [chunk_id for chunk_id in self.loaded_chunks if chunk_id not in needed]:
+            self._evict_chunk(chunk_id)
+        for chunk_id in needed:
+            if chunk_id not in self.loaded_chunks and chunk_id in self.chunk_entries:
+                self._load_chunk(chunk_id)
+        self._mark_indexes_dirty()
+
+    def _load_chunk(self, chunk_id):
+        """Создает спрайты чанка; собранные монеты и буквы пропускаются"""
+        layout = self.layout
+        entries = self.chunk_entries[chunk_id]
+        sprites = {"walls": [], "spikes": [], "coins": [], "letters": []}
+
+        for index in entries["platforms"]:
+            x, y, width, color_index = layout.platforms[index]
+            sprites["walls"].append(self._add_platform(x, y, width, 20, PLATFORM_COLORS[color_index]))
+        for index in entries["spikes"]:
+            spike = Spike(*layout.spikes[index])
+            self.spikes_list.append(spike)
+            sprites["spikes"].append(spike)
+        for index in entries["coins"]:
+            if index not in self.collected_coin_ids:
+                x, y = layout.coins[index]
+                sprites["coins"].append(self._add_coin(x, y, index))
+        for index in entries["letters"]:
+            if index not in self.collected_letter_ids:
+                x, y, letter_char, word = layout.letters[index]
+                if word in self.words_to_collect:
+                    sprites["letters"].append(self._add_letter(x, y, letter_char, word, index))
+
+        self.loaded_chunks[chunk_id] = sprites
+
+    def _evict_chunk(self, chunk_id):
+        """Выгружает чанк: стены и шипы удаляются, монеты и буквы уходят в пулы"""
+        sprites = self.loaded_chunks.pop(chunk_id)
+        for wall in sprites["walls"]:
+            self.wall_list.remove(wall)
+            self.physics_engine.remove_wall(wall)
+        for spike in sprites["spikes"]:
+            self.spikes_list.remove(spike)
+        for coin in sprites["coins"]:
+            self.coins_list.remove(coin)
+            self.coin_grid.remove(coin)
+        for letter in sprites["letters"]:
+            self.letters_list.remove(letter)
+            self.letter_grid.remove(letter)
+        self.coin_pool.release(sprites["coins"])
+        self.letter_pool.release(sprites["letters"])
+
+    def _evict_all_chunks(self):
+        """Выгружает все чанки, следующий _stream_chunks построит окно заново"""
+        for chunk_id in list(self.loaded_chunks):
+            self._evict_chunk(chunk_id)
+        self.streamed_range = None
+        self._mark_indexes_dirty()
+
+    def _mark_indexes_dirty(self):
+        """Список шипов изменился - индекс пересоберется при запросе"""
+        self.spike_index.mark_dirty()
 
-            platform_visual = Platform(floor_center_x, 20, floor_width, 40, arcade.color.DARK_SLATE_GRAY)
-            self.platform_visual_list.append(platform_visual)
+    def _spawn_world_elements(self):
+        """Один шаг генерации в главном потоке"""
+        self.generator.spawn_world_elements()
+        self._index_layout_entries()
+
+    def _load_level_words(self, level):
+        """Слова уровня, которые пора повторить - выбираются один раз при первом обращении"""
+        if level not in self.level_words:
+            self._set_level_words(
+                level, self.scheduler.next_words(level, LEVEL_WORD_COUNTS[level], LEVEL_LETTER_LIMITS[level])
+            )
+        return self.level_words[level]
 
-            # Первая платформа
-            first_x = LEVEL_2_START + 200
-            first_y = 300
-            first_width = 160
+    def _set_level_words(self, level, words):
+        """Заводит прогресс по выбранным словам уровня [(word, translation)]"""
+        if level in self.level_words:
+            return
+        self.level_words[level] = []
+        for word, translation in words:
+            # reviewed - ответ по слову уже записан в планировщик
+            self.words_to_collect[word] = {"letters": list(word), "translation": translation,
+                                           "reviewed": False}
+            self._reset_word_progress(word)
+            self.level_words[level].append(word)
+
+    def _unload_level_words(self, level):
+        """Забывает слова пройденного уровня"""
+        for word in self.level_words.pop(level, []):
+            self.words_to_collect.pop(word, None)
+        self.letter_queues.pop(level, None)
+
+    def _letter_queue(self, level):
+        """Очередь (слово, буква) уровня для генерации"""
+        if level not in self.letter_queues:
+            self.letter_queues[level] = LetterQueue(self._load_level_words(level))
+        return self.letter_queues[level]
+
+    def _current_letter_queue(self):
+        """Очередь букв текущего уровня"""
+        return self._letter_queue(self.current_level)
+
+    def _finish_level_layout(self):
+        """Генерация закончена - сохраняем раскладку в кэш"""
+        self.generator = None
+        if self.use_layout_cache:
+            self.layout.save()
+        self._level_ready()
+
+    def _level_ready(self):
+        """Уровень готов к игре: снимок для рестартов и фоновая генерация следующего"""
+        self._drop_unplaced_words()
+        self._capture_level_snapshot()
+        self._stream_chunks()
+        self._prefetch_next_level()
+
+    def _drop_unplaced_words(self):
+        """Снимает с уровня слова, буквам которых не хватило платформ
+
+        Такое слово не собрать, поэтому и промахом в планировщике оно не считается.
+        """
+        level = self.current_level
+        placed = collections.Counter(word for x, y, letter_char, word in self.layout.letters)
+        words = self.level_words.get(level, [])
+        unplaced = [word for word in words if placed[word] < len(word)]
+        if not unplaced:
+            return
+        print(f"Не хватило платформ для слов: {', '.join(unplaced)}")
+        for word in unplaced:
+            self.words_to_collect.pop(word, None)
+        # Новый список: очередь букв уровня держит ссылку на старый
+        self.level_words[level] = [word for word in words if word not in unplaced]
+
+    def _prefetch_next_level(self):
+        """Запускает генерацию следующего уровня в фоновом потоке
+
+        В потоке выбираются слова и создаются только данные раскладки,
+        спрайты строятся в главном потоке при переходе на уровень.
+        """
+        next_level = self.current_level + 1
+        if next_level not in LEVEL_RANGES or next_level in self.prefetched_layouts:
+            return
+        words = None
+        if self.vocabulary.db_path is None and next_level not in self.level_words:
+            # Словарь в памяти другому потоку недоступен - выбираем слова здесь
+            self._load_level_words(next_level)
+        if next_level in self.level_words:
+            words = [(word, self.words_to_collect[word]["translation"]) for word in self.level_words[next_level]]
+        self.prefetched_layouts[next_level] = self.layout_executor.submit(
+            prepare_level,
+            self.scheduler,
+            next_level,
+            self._level_seed(next_level),
+            LEVEL_PLATFORM_COUNTS[next_level],
+            words,
+            self.use_layout_cache,
+        )
 
-            physics_sprite = arcade.SpriteSolidColor(first_width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = first_x
-            physics_sprite.center_y = first_y
-            self.wall_list.append(physics_sprite)
+    def _capture_level_snapshot(self):
+        """Запоминает позицию очереди букв готового уровня
 
-            platform_visual = Platform(first_x, first_y, first_width, 20, arcade.color.DARK_GREEN)
-            self.platform_visual_list.append(platform_visual)
+        Остальное состояние уровня восстанавливается из раскладки:
+        достаточно забыть собранные монеты и буквы и перестроить чанки.
+        """
+        self.level_snapshot = {
+            "letter_queue": self._current_letter_queue().tell(),
+        }
 
-            self.max_spawn_x = first_x + first_width // 2
+    def _restore_level_snapshot(self):
+        """Возвращает уровень к снимку без повторной генерации"""
+        self._evict_all_chunks()
+        self.collected_coin_ids.clear()
+        self.collected_letter_ids.clear()
+        self._current_letter_queue().seek(self.level_snapshot["letter_queue"])
+
+    def _add_coin(self, x, y, layout_index):
+        """Берет монетку из пула"""
+        coin = self.coin_pool.acquire(x, y)
+        coin.layout_index = layout_index
+        self.coins_list.append(coin)
+        self.coin_grid.add(coin)
+        return coin
+
+    def _add_letter(self, x, y, letter_char, word, layout_index):
+        """Берет букву из пула"""
+        letter = self.letter_pool.acquire(x, y, letter_char, word)
+        letter.layout_index = layout_index
+        self.letters_list.append(letter)
+        self.letter_grid.add(letter)
+        return letter
 
-        elif self.current_level == 3:
-            # Пол третьего уровня
-            floor_width = LEVEL_3_END - LEVEL_3_START
-            floor_center_x = LEVEL_3_START + floor_width // 2
+    def _check_letter_collisions(self):
+        """Проверка букв - ОПТИМИЗИРОВАННАЯ"""
+        # Кэшируем координаты игрока
+        px = self.player_sprite.center_x
+        py = self.player_sprite.center_y
+        p_half_width = self.player_sprite.width // 2
+        p_half_height = self.player_sprite.height // 2
 
-            # Пол
-            physics_sprite = arcade.SpriteSolidColor(floor_width, 40, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = floor_center_x
-            physics_sprite.center_y = 20
-            self.wall_list.append(physics_sprite)
+        # Проверяем только несобранные буквы из соседних ячеек сетки
+        for letter in self.letter_grid.near(px, py):
+            letter_x = letter.center_x
+            letter_y = letter.center_y
 
-            platform_visual = Platform(floor_center_x, 20, floor_width, 40, arcade.color.DARK_SLATE_GRAY)
-            self.platform_visual_list.append(platform_visual)
+            # Простая проверка расстояния
+            dx = letter_x - px
+            dy = letter_y - py
+            if dx * dx + dy * dy < 1600:  # 40px радиус
+                # Нельзя собрать снизу
+                player_top = py + p_half_height
+                letter_bottom = letter_y - 20
+                if player_top > letter_bottom:
+                    letter.collected = True
+                    self._release_collected(letter, "letters")
+                    self.collected_letters.append(letter.letter)
+                    self._process_letter_collection(letter)
+                    self.score += 20
+                    self.check_word_completion(letter.word)
 
-            # Первая платформа
-            first_x = LEVEL_3_START + 200
-            first_y = 400
-            first_width = 160
+    def _check_coin_collisions(self):
+        """Проверка монет - ОПТИМИЗИРОВАННАЯ"""
+        # Кэшируем координаты игрока
+        px = self.player_sprite.center_x
+        py = self.player_sprite.center_y
+        p_half_width = self.player_sprite.width // 2
+        p_half_height = self.player_sprite.height // 2
 
-            physics_sprite = arcade.SpriteSolidColor(first_width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = first_x
-            physics_sprite.center_y = first_y
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(first_x, first_y, first_width, 20, arcade.color.DARK_GREEN)
-            self.platform_visual_list.append(platform_visual)
-
-            self.max_spawn_x = first_x + first_width // 2
-
-        elif self.current_level == 4:
-            # Пол четвертого уровня
-            floor_width = LEVEL_4_END - LEVEL_4_START
-            floor_center_x = LEVEL_4_START + floor_width // 2
-
-            # Пол
-            physics_sprite = arcade.SpriteSolidColor(floor_width, 40, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = floor_center_x
-            physics_sprite.center_y = 20
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(floor_center_x, 20, floor_width, 40, arcade.color.DARK_SLATE_GRAY)
-            self.platform_visual_list.append(platform_visual)
-
-            # Первая платформа
-            first_x = LEVEL_4_START + 200
-            first_y = 400
-            first_width = 160
-
-            physics_sprite = arcade.SpriteSolidColor(first_width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = first_x
-            physics_sprite.center_y = first_y
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(first_x, first_y, first_width, 20, arcade.color.DARK_GREEN)
-            self.platform_visual_list.append(platform_visual)
-
-            self.max_spawn_x = first_x + first_width // 2
-
-        else:  # Уровень 5
-            # Пол пятого уровня
-            floor_width = WORLD_BOUNDARY - LEVEL_5_START
-            floor_center_x = LEVEL_5_START + floor_width // 2
-
-            # Пол
-            physics_sprite = arcade.SpriteSolidColor(floor_width, 40, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = floor_center_x
-            physics_sprite.center_y = 20
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(floor_center_x, 20, floor_width, 40, arcade.color.DARK_SLATE_GRAY)
-            self.platform_visual_list.append(platform_visual)
-
-            # Первая платформа
-            first_x = LEVEL_5_START + 200
-            first_y = 400
-            first_width = 160
-
-            physics_sprite = arcade.SpriteSolidColor(first_width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = first_x
-            physics_sprite.center_y = first_y
-            self.wall_list.append(physics_sprite)
-
-            platform_visual = Platform(first_x, first_y, first_width, 20, arcade.color.DARK_GREEN)
-            self.platform_visual_list.append(platform_visual)
-
-            self.max_spawn_x = first_x + first_width // 2
-
-    def spawn_spikes_on_floor(self, start_x, count=None):
-        """Создает шипы с проверкой границ"""
-        if self.current_level not in [4, 5]:
-            return
-
-        if count is None:
-            count = random.randint(SPIKES_MIN_COUNT, SPIKES_MAX_COUNT)
-
-        total_width = count * SPIKE_WIDTH
-
-        # Определяем границы уровня
-        if self.current_level == 4:
-            level_end = LEVEL_4_END
-        else:  # level 5
-            level_end = WORLD_BOUNDARY
-
-        # Проверяем, не выходят ли шипы за границу
-        if start_x + total_width > level_end - 100:  # Отступ 100px
-            return  # Не создаем
-
-        start_x = start_x + total_width // 2
-
-        for i in range(count):
-            spike_x = start_x + (i - count // 2) * SPIKE_WIDTH
-
-            # Проверка каждого шипа
-            if spike_x > level_end - 50:  # Отступ 50px
-                continue
-
-            spike = Spike(spike_x, 20 + SPIKE_HEIGHT)
-            self.spikes_list.append(spike)
-
-    def spawn_platform(self, start_x):
-        """Генерирует новую платформу"""
-        MAX_ATTEMPTS = 5
-        MIN_HORIZONTAL_CLEARANCE = 8
-        MIN_VERTICAL_SEPARATION = 40
-
-        for attempt in range(MAX_ATTEMPTS):
-            # Параметры зависят от уровня
-            if self.current_level == 2:
-                gap = random.randint(150, 320)
-                width = random.randint(60, 200)
-                y = random.randint(180, 550)
-            elif self.current_level == 3 or self.current_level == 4 or self.current_level == 5:
-                gap = random.randint(120, 280)
-                width = random.randint(80, 220)
-                y = random.randint(300, 600)
-            else:
-                gap = random.randint(PLATFORM_MIN_GAP, PLATFORM_MAX_GAP)
-                width = random.randint(PLATFORM_MIN_WIDTH, PLATFORM_MAX_WIDTH)
-                y = random.randint(PLATFORM_MIN_Y, PLATFORM_MAX_Y)
-
-            platform_left = start_x + gap
-            platform_right = platform_left + width
-            platform_x = platform_left + width // 2
-
-            # Ограничиваем генерацию
-            if self.current_level == 1 and platform_right > LEVEL_1_END - 500:
-                continue
-            elif self.current_level == 2 and platform_right > LEVEL_2_END:
-                continue
-            elif self.current_level == 3 and platform_right > LEVEL_3_END:
-                continue
-            elif self.current_level == 4 and platform_right > LEVEL_4_END:
-                continue
-            elif platform_right > WORLD_BOUNDARY:
-                continue
-
-            # Проверяем пересечения
-            intersects = False
-            for wall in self.wall_list:
-                wall_left = wall.center_x - wall.width // 2
-                wall_right = wall.center_x + wall.width // 2
-                wall_y = wall.center_y
-
-                horizontal_overlap = not (
-                        platform_right + MIN_HORIZONTAL_CLEARANCE < wall_left or
-                        platform_left - MIN_HORIZONTAL_CLEARANCE > wall_right
-                )
-                vertical_close = abs(y - wall_y) < MIN_VERTICAL_SEPARATION
-
-                if horizontal_overlap and vertical_close:
-                    intersects = True
-                    break
-
-            if intersects:
-                continue
-
-            color = random.choice([
-                arcade.color.DARK_GREEN, arcade.color.OLIVE,
-                arcade.color.DARK_ORANGE, arcade.color.DARK_CERULEAN,
-                arcade.color.DARK_RED, arcade.color.DARK_VIOLET
-            ])
-
-            # Создаем физическую платформу
-            physics_sprite = arcade.SpriteSolidColor(width, 20, arcade.color.TRANSPARENT_BLACK)
-            physics_sprite.center_x = platform_x
-            physics_sprite.center_y = y
-            self.wall_list.append(physics_sprite)
-
-            # Создаем визуальную платформу
-            platform_visual = Platform(platform_x, y, width, 20, color)
-            self.platform_visual_list.append(platform_visual)
-
-            right_edge = platform_x + width // 2
-            if right_edge > self.max_spawn_x:
-                self.max_spawn_x = right_edge
-
-            # Добавляем шипы на четвертом и пятом уровнях
-            if self.current_level in [4, 5] and random.random() < SPIKES_PROBABILITY:
-                self.spawn_spikes_on_floor(platform_x + width // 2 + 100)
-
-            return {"x": platform_x, "y": y, "width": width}
-
-        return None
-
-    def _spawn_world_elements(self):
-        """Генерация элементов мира - сначала буквы, потом монетки"""
-        new_platform = self.spawn_platform(self.max_spawn_x)
-        if new_platform:
-            platform_width = new_platform["width"]
-            platform_x = new_platform["x"]
-            platform_y = new_platform["y"]
-
-            # Проверяем есть ли еще буквы в очереди для текущего уровня
-            has_letters = (
-                    (self.current_level == 1 and self.letter_queue_level1) or
-                    (self.current_level == 2 and self.letter_queue_level2) or
-                    (self.current_level == 3 and self.letter_queue_level3) or
-                    (self.current_level == 4 and self.letter_queue_level4) or
-                    (self.current_level == 5 and self.letter_queue_level5)
-            )
-
-            if has_letters:
-                # БУКВА - 100% если есть в очереди
-                letter_offset = random.uniform(-platform_width * 0.4, -platform_width * 0.1)
-
-                if self.current_level == 1 and self.letter_queue_level1:
-                    word, letter_char = self.letter_queue_level1.pop(0)
-                    letter = Letter(platform_x + letter_offset, platform_y + 30, letter_char, word)
-                    self.letters_list.append(letter)
-                elif self.current_level == 2 and self.letter_queue_level2:
-                    word, letter_char = self.letter_queue_level2.pop(0)
-                    letter = Letter(platform_x + letter_offset, platform_y + 30, letter_char, word)
-                    self.letters_list.append(letter)
-                elif self.current_level == 3 and self.letter_queue_level3:
-                    word, letter_char = self.letter_queue_level3.pop(0)
-                    letter = Letter(platform_x + letter_offset, platform_y + 30, letter_char, word)
-                    self.letters_list.append(letter)
-                elif self.current_level == 4 and self.letter_queue_level4:
-                    word, letter_char = self.letter_queue_level4.pop(0)
-                    letter = Letter(platform_x + letter_offset, platform_y + 30, letter_char, word)
-                    self.letters_list.append(letter)
-                elif self.current_level == 5 and self.letter_queue_level5:
-                    word, letter_char = self.letter_queue_level5.pop(0)
-                    letter = Letter(platform_x + letter_offset, platform_y + 30, letter_char, word)
-                    self.letters_list.append(letter)
-            else:
-                # МОНЕТКА - только если буквы закончились
-                coin_offset = random.uniform(-platform_width * 0.4, platform_width * 0.4)
-                coin = Coin(platform_x + coin_offset, platform_y + 30)
-                self.coins_list.append(coin)
-
-    def _check_letter_collisions(self):
-        """Проверка букв - ОПТИМИЗИРОВАННАЯ"""
-        # Кэшируем координаты игрока
-        px = self.player_sprite.center_x
-        py = self.player_sprite.center_y
-        p_half_width = self.player_sprite.width // 2
-        p_half_height = self.player_sprite.height // 2
-
-        # Проверяем только буквы рядом
-        check_left = px - 120
-        check_right = px + 120
-        check_top = py + 120
-        check_bottom = py - 120
-
-        for letter in self.letters_list:
-            if letter.collected:
-                continue
-
-            letter_x = letter.center_x
-            letter_y = letter.center_y
-
-            # Быстрая фильтрация
-            if (letter_x < check_left or letter_x > check_right or
-                    letter_y < check_bottom or letter_y > check_top):
-                continue
-
-            # Простая проверка расстояния
-            dx = letter_x - px
-            dy = letter_y - py
-            if dx * dx + dy * dy < 1600:  # 40px радиус
-                # Нельзя собрать снизу
-                player_top = py + p_half_height
-                letter_bottom = letter_y - 20
-                if player_top > letter_bottom:
-                    letter.collected = True
-                    self.collected_letters.append(letter.letter)
-                    self._process_letter_collection(letter)
-                    self.score += 20
-                    self.check_word_completion()
-
-    def _check_coin_collisions(self):
-        """Проверка монет - ОПТИМИЗИРОВАННАЯ"""
-        # Кэшируем координаты игрока
-        px = self.player_sprite.center_x
-        py = self.player_sprite.center_y
-        p_half_width = self.player_sprite.width // 2
-        p_half_height = self.player_sprite.height // 2
-
-        # Проверяем только монеты рядом
-        check_left = px - 120
-        check_right = px + 120
-        check_top = py + 120
-        check_bottom = py - 120
-
-        for coin in self.coins_list:
-            if coin.collected:
-                continue
-
-            coin_x = coin.center_x
-            coin_y = coin.center_y
-
-            # Быстрая фильтрация
-            if (coin_x < check_left or coin_x > check_right or
-                    coin_y < check_bottom or coin_y > check_top):
-                continue
+        # Проверяем только несобранные монеты из соседних ячеек сетки
+        for coin in self.coin_grid.near(px, py):
+            coin_x = coin.center_x
+            coin_y = coin.center_y
 
             # Простая проверка расстояния
             dx = coin_x - px
@@ -759,174 +2009,51 @@ class MyGame(arcade.Window):
                 coin_bottom = coin_y - 20
                 if player_top > coin_bottom:
                     coin.collected = True
+                    self._release_collected(coin, "coins")
                     self.coins_collected += 1
                     self.score += 10
 
+    def _release_collected(self, sprite, kind):
+        """Убирает собранную монету или букву из мира и возвращает в пул
+
+        Индекс в раскладке запоминается, чтобы чанк при повторной
+        постройке не вернул предмет.
+        """
+        self.loaded_chunks[self._chunk_of(sprite.center_x)][kind].remove(sprite)
+        if kind == "coins":
+            self.collected_coin_ids.add(sprite.layout_index)
+            self.coins_list.remove(sprite)
+            self.coin_grid.remove(sprite)
+            self.coin_pool.release([sprite])
+        else:
+            self.collected_letter_ids.add(sprite.layout_index)
+            self.letters_list.remove(sprite)
+            self.letter_grid.remove(sprite)
+            self.letter_pool.release([sprite])
+
+    def _reset_word_progress(self, word):
+        """Обнуляет прогресс слова
+
+        needed - сколько раз каждая буква встречается в слове, remaining -
+        сколько букв еще не собрано: по нему завершение слова видно сразу.
+        """
+        data = self.words_to_collect[word]
+        data["collected"] = False
+        data["needed"] = {}
+        for letter in data["letters"]:
+            data["needed"][letter] = data["needed"].get(letter, 0) + 1
+        data["progress"] = dict.fromkeys(data["needed"], 0)
+        data["remaining"] = len(data["letters"])
+
     def _process_letter_collection(self, letter):
         """Обработка собранной буквы"""
         if letter.word and letter.word in self.words_to_collect:
             data = self.words_to_collect[letter.word]
             if not data["collected"]:
-                needed_count = data["letters"].count(letter.letter)
                 current_count = data["progress"].get(letter.letter, 0)
-                if current_count < needed_count:
+                if current_count < data["needed"].get(letter.letter, 0):
                     data["progress"][letter.letter] = current_count + 1
-
-    def _draw_hud(self):
-        """Отрисовка HUD"""
-        arcade.draw_text(
-            f"Уровень: {self.current_level}",
-            10, SCREEN_HEIGHT - 30, arcade.color.BLACK, 20
-        )
-        arcade.draw_text(
-            "← → : Двигаться    ↑/Пробел : Прыжок",
-            10, SCREEN_HEIGHT - 60, arcade.color.WHITE, 14
-        )
-        arcade.draw_text(f"Монеты: {self.coins_collected}", 10, SCREEN_HEIGHT - 84, arcade.color.WHITE, 14)
-        arcade.draw_text(f"Собрано букв: {len(self.collected_letters)}", 10, SCREEN_HEIGHT - 108, arcade.color.WHITE,
-                         14)
-
-        # Отрисовка информации о бонусах в правом верхнем углу
-        bonus_x = SCREEN_WIDTH - 380
-        bonus_y = SCREEN_HEIGHT - 40
-
-        # Заголовок бонусов
-        arcade.draw_text(
-            "ПОКУПКА БОНУСОВ:",
-            bonus_x, bonus_y,
-            arcade.color.GOLD, 18
-        )
-
-        # Ускорение (клавиша 1)
-        arcade.draw_text(
-            "Клавиша 1 - Ускорение (2 монет)",
-            bonus_x, bonus_y - 40,
-            arcade.color.GREEN, 14
-        )
-
-        # Усиление прыжка (клавиша 2)
-        arcade.draw_text(
-            "Клавиша 2 - Усиление прыжка (3 монет)",
-            bonus_x, bonus_y - 70,
-            arcade.color.GREEN, 14
-        )
-
-        # Щит (клавиша 3)
-        arcade.draw_text(
-            "Клавиша 3 - Щит (5 монет)",
-            bonus_x, bonus_y - 100,
-            arcade.color.GREEN, 14
-        )
-
-        # Количество щитов
-        arcade.draw_text(
-            f"Щитов: {self.shield_count}",
-            bonus_x, bonus_y - 130,
-            arcade.color.LIGHT_BLUE, 16
-        )
-
-        # Активные бонусы
-        current_time = time.time()
-        active_bonuses_y = bonus_y - 190
-
-        if self.speed_boost_active:
-            time_left = max(0, int(self.speed_boost_end_time - current_time))
-            arcade.draw_text(
-                f"Ускорение: {time_left}с",
-                bonus_x, active_bonuses_y,
-                arcade.color.GREEN, 14
-            )
-            active_bonuses_y -= 25
-
-        if self.jump_boost_active:
-            time_left = max(0, int(self.jump_boost_end_time - current_time))
-            arcade.draw_text(
-                f"Прыжок усилен: {time_left}с",
-                bonus_x, active_bonuses_y,
-                arcade.color.GREEN, 14
-            )
-            active_bonuses_y -= 25
-
-        # Сообщение о покупке бонуса
-        if self.bonus_message_timer > 0:
-            arcade.draw_text(
-                self.bonus_purchase_message,
-                SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100,
-                arcade.color.GREEN, 24,
-                align="center", anchor_x="center", anchor_y="center"
-            )
-
-        y_offset = SCREEN_HEIGHT - 140
-        for i, (word, translation) in enumerate(self.completed_words):
-            arcade.draw_text(
-                f"{word} - {translation}",
-                10, y_offset - i * 30,
-                arcade.color.BLACK, 16
-            )
-
-        if self.show_death_message:
-            message = "СМЕРТЬ ОТ ШИПОВ!" if self.death_type == "spikes" else "СМЕРТЬ ОТ ПАДЕНИЯ!"
-            arcade.draw_text(
-                message,
-                SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2,
-                arcade.color.RED, 36,
-                align="center", anchor_x="center", anchor_y="center"
-            )
-
-    def _draw_loading_screen(self):
-        """Отрисовка экрана загрузки"""
-        # Фон
-        arcade.draw_lrbt_rectangle_filled(
-            0, SCREEN_WIDTH, 0, SCREEN_HEIGHT,
-            arcade.color.WHITE
-        )
-
-        # Текст
-        arcade.draw_text(
-            "ПОЖАЛУЙСТА ПОДОЖДИТЕ, СОЗДАЕМ И НАСТРАИВАЕМ МИР...",
-            SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80,
-            arcade.color.BLACK, 28,
-            align="center", anchor_x="center", anchor_y="center"
-        )
-
-        # Рамка прогресс-бара
-        bar_width = 600
-        bar_height = 40
-        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
-        bar_y = SCREEN_HEIGHT // 2 - 20
-
-        # Фон прогресс-бара
-        arcade.draw_lrbt_rectangle_filled(
-            bar_x, bar_x + bar_width,
-            bar_y, bar_y + bar_height,
-            arcade.color.DARK_GRAY
-        )
-
-        # Заполнение прогресс-бара
-        fill_width = (bar_width * self.loading_progress) / 100
-        if fill_width > 0:
-            arcade.draw_lrbt_rectangle_filled(
-                bar_x, bar_x + fill_width,
-                       bar_y + 3, bar_y + bar_height - 3,
-                arcade.color.GREEN
-            )
-
-        # Процент
-        arcade.draw_text(
-            f"{int(self.loading_progress)}%",
-            SCREEN_WIDTH // 2, bar_y - 40,
-            arcade.color.WHITE, 24,
-            align="center", anchor_x="center", anchor_y="center"
-        )
-
-        # Статус
-        status_text = f"Сгенерировано платформ: {self.platforms_generated}/{self.total_platforms_to_generate}"
-        arcade.draw_text(
-            status_text,
-            SCREEN_WIDTH // 2, bar_y - 80,
-            arcade.color.LIGHT_GRAY, 18,
-            align="center", anchor_x="center", anchor_y="center"
-        )
+                    data["remaining"] -= 1
 
     def check_spikes_collision(self):
         """Проверка шипов - ОПТИМИЗИРОВАННАЯ"""
@@ -942,11 +2069,8 @@ class MyGame(arcade.Window):
         check_left = px - 150
         check_right = px + 150
 
-        for spike in self.spikes_list:
-            # Быстрая фильтрация по X
+        for spike in self.spike_index.query(check_left, check_right):
             spike_x = spike.center_x
-            if spike_x < check_left or spike_x > check_right:
-                continue
 
             # Простая круговая проверка (быстрее прямоугольников)
             dx = spike_x - px
@@ -998,528 +2122,196 @@ class MyGame(arcade.Window):
 
     def transition_to_level_2(self):
         """Переход на второй уровень"""
-        self.current_level = 2
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
-        self.collected_letters = []
-
-        # Очищаем собранные слова первого уровня
-        self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["cat", "dog"]]
-
-        self.max_spawn_x = LEVEL_2_START
-
-        # ЗАПУСКАЕМ ЗАГРУЗКУ ДЛЯ ВТОРОГО УРОВНЯ
-        self.is_loading = True
-        self.loading_progress = 0
-        self.platforms_generated = 0
-        self.total_platforms_to_generate = 60
-
-        # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_2_START + 100
-        self.player_sprite.center_y = 300
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        self.fall_start_height = None  # Сбрасываем высоту падения
-        self.was_on_ground = True
-
-        # Создаем начальные платформы
-        self.create_initial_platforms()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        self._enter_level(2)
 
     def transition_to_level_3(self):
         """Переход на третий уровень"""
-        self.current_level = 3
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
-        self.collected_letters = []
-
-        # Очищаем собранные слова второго уровня
-        self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["mother", "father", "brother"]]
-
-        self.max_spawn_x = LEVEL_3_START
-
-        # ЗАПУСКАЕМ ЗАГРУЗКУ ДЛЯ ТРЕТЬЕГО УРОВНЯ
-        self.is_loading = True
-        self.loading_progress = 0
-        self.platforms_generated = 0
-        self.total_platforms_to_generate = 50
-
-        # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_3_START + 100
-        self.player_sprite.center_y = 400
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        self.fall_start_height = None  # Сбрасываем высоту падения
-        self.was_on_ground = True
-
-        # Создаем начальные платформы
-        self.create_initial_platforms()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        self._enter_level(3)
 
     def transition_to_level_4(self):
-        """Переход на четвертый уровень"""
-        self.current_level = 4
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
-        self.collected_letters = []
-
-        # Очищаем собранные слова третьего уровня
-        self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["food", "pizza", "bread"]]
-
-        self.max_spawn_x = LEVEL_4_START
-
-        # ЗАПУСКАЕМ ЗАГРУЗКУ ДЛЯ ЧЕТВЕРТОГО УРОВНЯ
-        self.is_loading = True
-        self.loading_progress = 0
-        self.platforms_generated = 0
-        self.total_platforms_to_generate = 50
-
-        # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_4_START + 100
-        self.player_sprite.center_y = 400
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        self.fall_start_height = None  # Сбрасываем высоту падения
-        self.was_on_ground = True
-
-        # Создаем начальные платформы
-        self.create_initial_platforms()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        """Переход на четвертый уровень"""
+        self._enter_level(4)
 
     def transition_to_level_5(self):
         """Переход на пятый уровень"""
-        self.current_level = 5
-
-        # Очищаем объекты
+        self._enter_level(5)
+
+    def _enter_level(self, level):
+        """Переход на уровень: очистка мира и запуск его построения"""
+        previous_words = self.level_words.get(self.current_level, [])
+        # Несобранные слова уходящего уровня планировщик покажет снова пораньше
+        self.scheduler.record(self.current_level, [(word, False) for word in previous_words
+                                                    if not self.words_to_collect[word]["reviewed"]])
+        self._unload_level_words(self.current_level)
+        self.current_level = level
+
+        # Очищаем объекты, монеты и буквы уходят в пулы
+        self._evict_all_chunks()
         self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
+        self.physics_engine.clear()
+        self.collected_coin_ids.clear()
+        self.collected_letter_ids.clear()
+        self.level_snapshot = None
         self.collected_letters = []
 
-        # Очищаем собранные слова четвертого уровня
+        # Очищаем собранные слова предыдущего уровня
         self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["math", "physics", "chemistry"]]
+                                if word not in previous_words]
 
-        self.max_spawn_x = LEVEL_5_START
-
-        # ЗАПУСКАЕМ ЗАГРУЗКУ ДЛЯ ПЯТОГО УРОВНЯ
+        # ЗАПУСКАЕМ ЗАГРУЗКУ - если уровень уже готов, она сразу выключится
         self.is_loading = True
         self.loading_progress = 0
         self.platforms_generated = 0
-        self.total_platforms_to_generate = 50
+        self.total_platforms_to_generate = LEVEL_PLATFORM_COUNTS[level]
 
         # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_5_START + 100
-        self.player_sprite.center_y = 400
+        self.player_sprite.center_x = LEVEL_RANGES[level][0] + 100
+        self.player_sprite.center_y = 300 if level == 2 else 400
         self.player_sprite.change_x = 0
         self.player_sprite.change_y = 0
         self.fall_start_height = None  # Сбрасываем высоту падения
         self.was_on_ground = True
 
-        # Создаем начальные платформы
+        # Создаем начальные платформы и раскладку уровня
         self.create_initial_platforms()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        self._begin_level_layout()
+        self._snap_interpolation()
 
     def check_fall_damage(self):
-        """Смерть от падения - ИСПРАВЛЕННАЯ версия"""
+        """Смерть от падения на пол
+
+        Опору и момент приземления сообщает физика, поэтому проверка
+        не перебирает стены: в воздухе запоминаем наивысшую точку,
+        при приземлении на пол сравниваем высоту падения с порогом.
+        """
         if self.current_level not in [3, 4, 5]:
             return
 
-        # Проверяем, стоит ли игрок на чем-либо (пол ИЛИ платформа)
-        is_on_something = False
-
-        # Простая проверка: если вертикальная скорость почти 0 и игрок не падает
-        if abs(self.player_sprite.change_y) < 0.1:  # Почти не движется по Y
-            # Дополнительная проверка: игрок находится близко к какой-то поверхности снизу
-            player_bottom = self.player_sprite.center_y - self.player_sprite.height // 2
-
-            # Быстрая проверка расстояния до ближайшей поверхности
-            # Ищем платформы/пол под игроком
-            for wall in self.wall_list:
-                wall_top = wall.center_y + wall.height // 2
-
-                # Если игрок находится над платформой и близко к ней
-                if (player_bottom <= wall_top + 5 and  # В пределах 5px
-                        player_bottom >= wall_top - 15 and  # Не слишком далеко
-                        abs(self.player_sprite.center_x - wall.center_x) < wall.width // 2 + 20):
-                    is_on_something = True
-                    break
-
-            # Также проверяем пол (Y ≤ 60)
-            if player_bottom <= 60:
-                is_on_something = True
-
-        if is_on_something:
-            # Стоит на чем-то (платформа ИЛИ пол) - проверяем высоту падения
-            if self.fall_start_height is not None:
-                fall_distance = self.fall_start_height - self.player_sprite.center_y
-
-                # Смерть ТОЛЬКО если падение на ПОЛ и высота > порога
-                player_bottom = self.player_sprite.center_y - self.player_sprite.height // 2
-                landed_on_floor = player_bottom <= 60  # Приземлился именно на пол
-
-                if landed_on_floor and fall_distance > FALL_DEATH_THRESHOLD:
-                    if self.shield_count > 0:
-                        self.shield_count -= 1
-                        self.shield_save_message = True
-                        self.shield_save_timer = 60
-                        self.bonus_purchase_message = "Щит спас от падения!"
-                        self.bonus_message_timer = 60
-                    else:
-                        self.show_death_message = True
-                        self.death_message_timer = 60
-                        self.death_type = "fall"
-
-                        if self.current_level == 3:
-                            self.restart_level_3()
-                        elif self.current_level == 4:
-                            self.restart_level_4()
-                        elif self.current_level == 5:
-                            self.restart_level_5()
-
-            # Сбрасываем высоту при приземлении на ЛЮБУЮ поверхность
-            self.fall_start_height = None
-
-        else:
+        physics = self.physics_engine
+        if physics.ground is None:
             # В воздухе
-            if self.fall_start_height is None:
-                self.fall_start_height = self.player_sprite.center_y
-            elif self.player_sprite.center_y > self.fall_start_height:
+            if self.fall_start_height is None or self.player_sprite.center_y > self.fall_start_height:
                 self.fall_start_height = self.player_sprite.center_y
+            return
 
-    def restart_level_3(self):
-        """Рестарт третьего уровня"""
-        # Восстанавливаем очередь букв
-        self.letter_queue_level3 = [
-            ("food", "f"), ("food", "o"), ("food", "o"), ("food", "d"),
-            ("pizza", "p"), ("pizza", "i"), ("pizza", "z"), ("pizza", "z"), ("pizza", "a"),
-            ("bread", "b"), ("bread", "r"), ("bread", "e"), ("bread", "a"), ("bread", "d"),
-        ]
-
-        # Сбрасываем прогресс слов
-        for word in ["food", "pizza", "bread"]:
-            if word in self.words_to_collect:
-                self.words_to_collect[word]["collected"] = False
-                self.words_to_collect[word]["progress"] = {}
-                for letter in self.words_to_collect[word]["letters"]:
-                    self.words_to_collect[word]["progress"][letter] = 0
-
-        # Удаляем слова из completed_words
-        self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["food", "pizza", "bread"]]
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
-        self.collected_letters = []
-
-        self.max_spawn_x = LEVEL_3_START
-
-        # ⛔️ НЕ ВКЛЮЧАЕМ ЗАГРУЗКУ - мгновенный рестарт
-        self.is_loading = False
-
-        # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_3_START + 100
-        self.player_sprite.center_y = 400
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        self.fall_start_height = None  # Сбрасываем высоту падения
-        self.was_on_ground = True
-
-        # Создаем начальные платформы
-        self.create_initial_platforms()
+        if physics.landed and self.fall_start_height is not None:
+            fall_distance = self.fall_start_height - self.player_sprite.center_y
 
-        # 🔥 ДОБАВИТЬ: ГЕНЕРАЦИЯ ПЛАТФОРМ ПРИ РЕСТАРТЕ
-        platforms_to_generate = 50  # Столько же сколько при загрузке 3 уровня
-        for _ in range(platforms_to_generate):
-            self._spawn_world_elements()
+            # Смерть ТОЛЬКО если падение на ПОЛ и высота > порога
+            if physics.ground is self.floor_platform and fall_distance > FALL_DEATH_THRESHOLD:
+                if self.shield_count > 0:
+                    self.shield_count -= 1
+                    self.shield_save_message = True
+                    self.shield_save_timer = 60
+                    self.bonus_purchase_message = "Щит спас от падения!"
+                    self.bonus_message_timer = 60
+                else:
+                    self.show_death_message = True
+                    self.death_message_timer = 60
+                    self.death_type = "fall"
+
+                    if self.current_level == 3:
+                        self.restart_level_3()
+                    elif self.current_level == 4:
+                        self.restart_level_4()
+                    elif self.current_level == 5:
+                        self.restart_level_5()
+
+        # Сбрасываем высоту при приземлении на ЛЮБУЮ поверхность
+        self.fall_start_height = None
 
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+    def restart_level_3(self):
+        """Рестарт третьего уровня"""
+        self._restart_level(LEVEL_3_START)
 
     def restart_level_4(self):
         """Рестарт четвертого уровня"""
-
-        # Восстанавливаем очередь букв
-        self.letter_queue_level4 = [
-            ("math", "m"), ("math", "a"), ("math", "t"), ("math", "h"),
-            ("physics", "p"), ("physics", "h"), ("physics", "y"), ("physics", "s"), ("physics", "i"), ("physics", "c"),
-            ("physics", "s"),
-            ("chemistry", "c"), ("chemistry", "h"), ("chemistry", "e"), ("chemistry", "m"), ("chemistry", "i"),
-            ("chemistry", "s"), ("chemistry", "t"), ("chemistry", "r"), ("chemistry", "y"),
-        ]
-
-        # Сбрасываем прогресс слов
-        for word in ["math", "physics", "chemistry"]:
-            if word in self.words_to_collect:
-                self.words_to_collect[word]["collected"] = False
-                self.words_to_collect[word]["progress"] = {}
-                for letter in self.words_to_collect[word]["letters"]:
-                    self.words_to_collect[word]["progress"][letter] = 0
-
-        # Удаляем слова из completed_words
-        self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["math", "physics", "chemistry"]]
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
-        self.collected_letters = []
-
-        self.max_spawn_x = LEVEL_4_START
-
-        # ⛔️ НЕ ВКЛЮЧАЕМ ЗАГРУЗКУ - мгновенный рестарт
-        self.is_loading = False
-
-        # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_4_START + 100
-        self.player_sprite.center_y = 400
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        self.fall_start_height = None  # Сбрасываем высоту падения
-        self.was_on_ground = True
-
-        # Создаем начальные платформы
-        self.create_initial_platforms()
-
-        # 🔥 ДОБАВИТЬ: ГЕНЕРАЦИЯ ПЛАТФОРМ ПРИ РЕСТАРТЕ
-        platforms_to_generate = 50  # Столько же сколько при загрузке 4 уровня
-        for _ in range(platforms_to_generate):
-            self._spawn_world_elements()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
+        self._restart_level(LEVEL_4_START)
 
     def restart_level_5(self):
         """Рестарт пятого уровня"""
+        self._restart_level(LEVEL_5_START)
 
-        # Восстанавливаем очередь букв
-        self.letter_queue_level5 = [
-            ("sofa", "s"), ("sofa", "o"), ("sofa", "f"), ("sofa", "a"),
-            ("table", "t"), ("table", "a"), ("table", "b"), ("table", "l"), ("table", "e"),
-            ("chair", "c"), ("chair", "h"), ("chair", "a"), ("chair", "i"), ("chair", "r"),
-        ]
+    def _restart_level(self, level_start):
+        """Мгновенный рестарт из снимка уровня
 
+        Платформы, шипы и физический движок остаются прежними -
+        сбрасываются только собранные монеты и буквы, очередь букв и прогресс слов.
+        """
         # Сбрасываем прогресс слов
-        for word in ["sofa", "table", "chair"]:
+        level_words = self._load_level_words(self.current_level)
+        for word in level_words:
             if word in self.words_to_collect:
-                self.words_to_collect[word]["collected"] = False
-                self.words_to_collect[word]["progress"] = {}
-                for letter in self.words_to_collect[word]["letters"]:
-                    self.words_to_collect[word]["progress"][letter] = 0
+                self._reset_word_progress(word)
 
         # Удаляем слова из completed_words
         self.completed_words = [(word, trans) for word, trans in self.completed_words
-                                if word not in ["sofa", "table", "chair"]]
-
-        # Очищаем объекты
-        self.wall_list.clear()
-        self.platform_visual_list.clear()
-        self.coins_list.clear()
-        self.letters_list.clear()
-        self.spikes_list.clear()
+                                if word not in level_words]
         self.collected_letters = []
 
-        self.max_spawn_x = LEVEL_5_START
+        # Возвращаем монеты, буквы и очередь букв к состоянию после генерации
+        self._restore_level_snapshot()
 
         # ⛔️ НЕ ВКЛЮЧАЕМ ЗАГРУЗКУ - мгновенный рестарт
         self.is_loading = False
 
         # Перемещаем игрока
-        self.player_sprite.center_x = LEVEL_5_START + 100
+        self.player_sprite.center_x = level_start + 100
         self.player_sprite.center_y = 400
         self.player_sprite.change_x = 0
         self.player_sprite.change_y = 0
         self.fall_start_height = None  # Сбрасываем высоту падения
         self.was_on_ground = True
+        self._stream_chunks()
+        self._snap_interpolation()
 
-        # Создаем начальные платформы
-        self.create_initial_platforms()
-
-        # 🔥 ДОБАВИТЬ: ГЕНЕРАЦИЯ ПЛАТФОРМ ПРИ РЕСТАРТЕ
-        platforms_to_generate = 50  # Столько же сколько при загрузке 5 уровня
-        for _ in range(platforms_to_generate):
-            self._spawn_world_elements()
-
-        # Обновляем физический движок
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.wall_list
-        )
-
-    def check_word_completion(self):
-        """Проверяет, собраны ли все буквы для какого-либо слова"""
-        for word, data in self.words_to_collect.items():
-            if data["collected"]:
-                continue
-
-            if self.current_level == 1 and word not in ["cat", "dog"]:
-                continue
-            if self.current_level == 2 and word not in ["mother", "father", "brother"]:
-                continue
-            if self.current_level == 3 and word not in ["food", "pizza", "bread"]:
-                continue
-            if self.current_level == 4 and word not in ["math", "physics", "chemistry"]:
-                continue
-            if self.current_level == 5 and word not in ["sofa", "table", "chair"]:
-                continue
-
-            all_letters_collected = True
-            for letter in data["letters"]:
-                needed_count = data["letters"].count(letter)
-                collected_count = data["progress"].get(letter, 0)
-                if collected_count < needed_count:
-                    all_letters_collected = False
-                    break
-
-            if all_letters_collected:
-                data["collected"] = True
-                if not any(w == word for w, t in self.completed_words):
-                    self.completed_words.append((word, data["translation"]))
-
-    def on_draw(self):
-        """Отрисовка игры - СУПЕР ОПТИМИЗИРОВАННАЯ"""
-        self.clear()
-
-        if self.is_loading:
-            self._draw_loading_screen()
+    def check_word_completion(self, word):
+        """Проверяет, собраны ли все буквы слова - по счетчику оставшихся букв"""
+        data = self.words_to_collect.get(word)
+        if data is None or data["collected"] or data["remaining"] > 0:
             return
 
-        # 1. ФОН
-        if self.background_list:
-            self.background_list.draw()
-
-        # 2. ВИДИМАЯ ОБЛАСТЬ
-        cam_left = self.camera_x
-        cam_right = self.camera_x + SCREEN_WIDTH
-
-        # 3. ПЛАТФОРМЫ - только видимые
-        for platform in self.platform_visual_list:
-            plat_left = platform.center_x - platform.width // 2
-            plat_right = platform.center_x + platform.width // 2
-
-            if plat_right >= cam_left and plat_left <= cam_right:
-                draw_left = plat_left - self.camera_x
-                draw_right = plat_right - self.camera_x
-                bottom = platform.center_y - platform.height // 2
-                top = platform.center_y + platform.height // 2
-                arcade.draw_lrbt_rectangle_filled(draw_left, draw_right, bottom, top, platform.color)
-
-        # 4. ШИПЫ
-        if self.current_level in [4, 5]:
-            for spike in self.spikes_list:
-                if cam_left <= spike.center_x <= cam_right:
-                    x = spike.center_x - self.camera_x
-                    y = spike.center_y
-                    # 🔥 Исправлено: draw_polygon вместо draw_triangle
-                    points = [
-                        (x, y + SPIKE_HEIGHT // 2),
-                        (x - SPIKE_WIDTH // 2, y - SPIKE_HEIGHT // 2),
-                        (x + SPIKE_WIDTH // 2, y - SPIKE_HEIGHT // 2)
-                    ]
-                    arcade.draw_polygon_filled(points, arcade.color.BLACK)
-                    arcade.draw_polygon_outline(points, arcade.color.DARK_RED, 2)
-
-        # 5. МОНЕТКИ
-        for coin in self.coins_list:
-            if not coin.collected and cam_left <= coin.center_x <= cam_right:
-                x = coin.center_x - self.camera_x
-                arcade.draw_circle_filled(x, coin.center_y, 15, arcade.color.GOLD)
-
-        # 6. БУКВЫ - 🔥 ИСПРАВЛЕНО: полная отрисовка как раньше
-        for letter in self.letters_list:
-            if not letter.collected and cam_left <= letter.center_x <= cam_right:
-                x = letter.center_x - self.camera_x
-                y = letter.center_y
-
-                # 1. Синий круг (фон буквы)
-                arcade.draw_circle_filled(x, y, 20, arcade.color.LIGHT_BLUE)
-
-                # 2. Темно-синяя обводка
-                arcade.draw_circle_outline(x, y, 20, arcade.color.DARK_BLUE, 2)
-
-                # 3. Сама буква черная по центру
-                arcade.draw_text(
-                    letter.letter.upper(),
-                    x, y,
-                    arcade.color.BLACK, 18,
-                    align="center", anchor_x="center", anchor_y="center"
-                )
-
-        # 7. ИГРОК
-        # 🔥 Исправлено: правильно работаем с камерой
-        for player in self.player_list:
-            player.center_x -= self.camera_x
-        self.player_list.draw()
-        for player in self.player_list:
-            player.center_x += self.camera_x
-
-        # 8. HUD
-        self._draw_hud()
+        data["collected"] = True
+        if not any(w == word for w, t in self.completed_words):
+            self.completed_words.append((word, data["translation"]))
+        if not data["reviewed"]:
+            # Повторный сбор после рестарта уровня ответом не считается
+            data["reviewed"] = True
+            self.scheduler.record(self.current_level, [(word, True)])
 
-    def on_update(self, delta_time):
-        """Обновление игры - ОПТИМИЗИРОВАННОЕ"""
+    def update(self, delta_time):
+        """Шаг симуляции - ОПТИМИЗИРОВАННЫЙ"""
         if self.is_loading:
-            # Загрузка
-            platforms_per_frame = 1
-            for _ in range(platforms_per_frame):
-                if self.platforms_generated < self.total_platforms_to_generate:
-                    self._spawn_world_elements()
-                    self.platforms_generated += 1
+            # Уровень генерируется в фоновом потоке - ждем готовую раскладку
+            if self.pending_layout is not None:
+                if self.pending_layout.done():
+                    self._use_pending_layout()
+                return
+
+            # Загрузка - генерируем столько, сколько помещается в бюджет кадра
+            frame_start = time.perf_counter()
+            while self.platforms_generated < self.total_platforms_to_generate:
+                self._spawn_world_elements()
+                self.platforms_generated += 1
+                if time.perf_counter() - frame_start >= self.loading_frame_budget:
+                    break
 
             self.loading_progress = (self.platforms_generated / self.total_platforms_to_generate) * 100
 
             if self.platforms_generated >= self.total_platforms_to_generate:
                 self.is_loading = False
+                self._finish_level_layout()
             return
 
+        self.sim_time += delta_time
+        self.previous_camera_x = self.camera_x
+        self.previous_player_position = self.player_sprite.position
+
         # Только основные проверки
         self.check_level_transition()
+        if self.is_loading:
+            # Переход запустил загрузку - остаток шага относится к старому уровню
+            return
 
         # Условные проверки для нужных уровней
         if self.current_level in [3, 4, 5]:
@@ -1545,6 +2337,9 @@ class MyGame(arcade.Window):
 
         self.camera_x += (target_x - self.camera_x) * 0.15
 
+        # Достраиваем чанки впереди и выгружаем оставшиеся позади
+        self._stream_chunks()
+
         # Таймеры
         if self.show_death_message:
             self.death_message_timer -= 1
@@ -1561,7 +2356,7 @@ class MyGame(arcade.Window):
 
         # Проверка времени бонусов
         if self.speed_boost_active or self.jump_boost_active:
-            current_time = time.time()
+            current_time = self.sim_time
             if self.speed_boost_active and current_time > self.speed_boost_end_time:
                 self.speed_boost_active = False
             if self.jump_boost_active and current_time > self.jump_boost_end_time:
@@ -1608,7 +2403,7 @@ class MyGame(arcade.Window):
 
         if self.coins_collected >= price:
             self.coins_collected -= price
-            current_time = time.time()
+            current_time = self.sim_time
 
             if bonus_type == "shield":
                 self.shield_count += 1
@@ -1627,53 +2422,271 @@ class MyGame(arcade.Window):
             self.bonus_purchase_message = f"Недостаточно монет!"
             self.bonus_message_timer = 60
 
-    def on_key_press(self, key, modifiers):
-        """Обработка нажатия клавиш"""
-        if self.is_loading:
-            return  # Игнорируем ввод во время загрузки
-
-        current_move_speed = PLAYER_MOVE_SPEED
-        current_jump_speed = PLAYER_JUMP_SPEED
+    def _snap_interpolation(self):
+        """После телепортации игрока не интерполируем из старой позиции"""
+        self.previous_camera_x = self.camera_x
+        self.previous_player_position = self.player_sprite.position
 
-        # Применяем бонусы скорости и прыжка
+    def _current_move_speed(self):
+        """Скорость движения с учетом бонуса"""
         if self.speed_boost_active:
-            current_move_speed = int(PLAYER_MOVE_SPEED * self.SPEED_BOOST_MULTIPLIER)
+            return int(PLAYER_MOVE_SPEED * self.SPEED_BOOST_MULTIPLIER)
+        return PLAYER_MOVE_SPEED
 
+    def _current_jump_speed(self):
+        """Скорость прыжка с учетом бонуса"""
         if self.jump_boost_active:
-            current_jump_speed = int(PLAYER_JUMP_SPEED * self.JUMP_BOOST_MULTIPLIER)
+            return int(PLAYER_JUMP_SPEED * self.JUMP_BOOST_MULTIPLIER)
+        return PLAYER_JUMP_SPEED
+
+    def move_left(self):
+        """Начать движение влево"""
+        self.player_sprite.change_x = -self._current_move_speed()
+
+    def move_right(self):
+        """Начать движение вправо"""
+        self.player_sprite.change_x = self._current_move_speed()
+
+    def stop_left(self):
+        """Отпущена клавиша движения влево"""
+        if self.player_sprite.change_x < 0:
+            self.player_sprite.change_x = 0
+
+    def stop_right(self):
+        """Отпущена клавиша движения вправо"""
+        if self.player_sprite.change_x > 0:
+            self.player_sprite.change_x = 0
+
+    def jump(self):
+        """Прыжок, если игрок на опоре"""
+        if self.physics_engine.can_jump():
+            self.player_sprite.change_y = self._current_jump_speed()
+
+
+
+class MyGame(arcade.Window):
+    """Окно игры: отрисовка GameWorld и передача ему ввода"""
+
+    def __init__(self, width, height, title, seed=LEVEL_SEED):
+        super().__init__(
+            width, height, title,
+            update_rate=RENDER_RATE, draw_rate=RENDER_RATE,
+            fixed_rate=SIMULATION_RATE, fixed_frame_cap=MAX_SIMULATION_STEPS_PER_FRAME,
+        )
+
+        self.world = GameWorld(seed)
+        self.background_list = None
+
+        # Камера
+        self.camera = arcade.Camera2D()
+
+        # HUD, оверлей производительности (F3) и заранее нарисованные текстуры
+        self.hud = Hud()
+        self.perf = PerfOverlay()
+        preload_textures()
+
+        arcade.set_background_color(arcade.color.SKY_BLUE)
+
+    def setup(self):
+        """Инициализация игры"""
+        self.background_list = arcade.SpriteList()
+
+        # Загрузка фона
+        if os.path.exists(BACKGROUND_IMAGE_PATH):
+            try:
+                self.background_texture = arcade.load_texture(BACKGROUND_IMAGE_PATH)
+                self.background_sprite = arcade.Sprite()
+                self.background_sprite.texture = self.background_texture
+                self.background_sprite.center_x = SCREEN_WIDTH // 2
+                self.background_sprite.center_y = SCREEN_HEIGHT // 2
+                self.background_sprite.width = SCREEN_WIDTH
+                self.background_sprite.height = SCREEN_HEIGHT
+                self.background_list.append(self.background_sprite)
+            except Exception as e:
+                self.background_list = None
+        else:
+            self.background_list = None
+
+        self.world.setup()
+
+    def _draw_hud(self):
+        """Отрисовка HUD"""
+        self.hud.update(self.world)
+        self.hud.draw()
+
+    def _draw_loading_screen(self):
+        """Отрисовка экрана загрузки"""
+        world = self.world
+
+        # Фон
+        arcade.draw_lrbt_rectangle_filled(
+            0, SCREEN_WIDTH, 0, SCREEN_HEIGHT,
+            arcade.color.WHITE
+        )
+
+        # Текст
+        arcade.draw_text(
+            "ПОЖАЛУЙСТА ПОДОЖДИТЕ, СОЗДАЕМ И НАСТРАИВАЕМ МИР...",
+            SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80,
+            arcade.color.BLACK, 28,
+            align="center", anchor_x="center", anchor_y="center"
+        )
+
+        # Рамка прогресс-бара
+        bar_width = 600
+        bar_height = 40
+        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
+        bar_y = SCREEN_HEIGHT // 2 - 20
+
+        # Фон прогресс-бара
+        arcade.draw_lrbt_rectangle_filled(
+            bar_x, bar_x + bar_width,
+            bar_y, bar_y + bar_height,
+            arcade.color.DARK_GRAY
+        )
+
+        # Заполнение прогресс-бара
+        fill_width = (bar_width * world.loading_progress) / 100
+        if fill_width > 0:
+            arcade.draw_lrbt_rectangle_filled(
+                bar_x, bar_x + fill_width,
+                       bar_y + 3, bar_y + bar_height - 3,
+                arcade.color.GREEN
+            )
+
+        # Процент
+        arcade.draw_text(
+            f"{int(world.loading_progress)}%",
+            SCREEN_WIDTH // 2, bar_y - 40,
+            arcade.color.WHITE, 24,
+            align="center", anchor_x="center", anchor_y="center"
+        )
+
+        # Статус
+        placed = len(world.layout.platforms) if world.layout else 0
+        status_text = (f"Сгенерировано платформ: {placed} "
+                       f"(шаг {world.platforms_generated}/{world.total_platforms_to_generate})")
+        arcade.draw_text(
+            status_text,
+            SCREEN_WIDTH // 2, bar_y - 80,
+            arcade.color.LIGHT_GRAY, 18,
+            align="center", anchor_x="center", anchor_y="center"
+        )
+
+    def on_draw(self):
+        """Отрисовка игры - СУПЕР ОПТИМИЗИРОВАННАЯ"""
+        self.clear()
+        world = self.world
+        # Без оверлея замеров нет - только проверки perf на None
+        perf = self.perf if self.perf.enabled else None
+        if perf:
+            perf.begin_frame()
+
+        if world.is_loading:
+            self._draw_loading_screen()
+            if perf:
+                perf.draw(world)
+            return
+
+        # 1. ФОН
+        if self.background_list:
+            self.background_list.draw()
+        if perf:
+            perf.lap("фон")
+
+        # 2. ВИДИМАЯ ОБЛАСТЬ - интерполяция между двумя последними тиками симуляции
+        alpha = min(GLOBAL_FIXED_CLOCK.fraction, 1.0)
+        camera_x = world.previous_camera_x + (world.camera_x - world.previous_camera_x) * alpha
+
+        # Весь мир рисуется в мировых координатах - прокрутку делает матрица камеры
+        self.camera.position = (camera_x + SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        with self.camera.activate():
+            # 3. ПЛАТФОРМЫ - один вызов отрисовки
+            world.wall_list.draw()
+            if perf:
+                perf.lap("платформы")
+
+            # 4. ШИПЫ - готовая текстура, один вызов отрисовки
+            world.spikes_list.draw()
+            if perf:
+                perf.lap("шипы")
+
+            # 5. МОНЕТКИ и 6. БУКВЫ - готовые текстуры, по вызову на список
+            world.coins_list.draw()
+            world.letters_list.draw()
+            if perf:
+                perf.lap("монеты и буквы")
+
+            # 7. ИГРОК - между двумя последними тиками симуляции. Спрайт не двигаем:
+            # сдвигаем камеру на разницу между его позицией и интерполированной
+            px, py = world.player_sprite.position
+            prev_x, prev_y = world.previous_player_position
+            self.camera.position = (
+                camera_x + SCREEN_WIDTH / 2 + (px - prev_x) * (1 - alpha),
+                SCREEN_HEIGHT / 2 + (py - prev_y) * (1 - alpha),
+            )
+            self.camera.use()
+            world.player_list.draw()
+        if perf:
+            perf.lap("игрок")
+
+        # 8. HUD
+        self._draw_hud()
+        if perf:
+            perf.lap("HUD")
+            perf.draw(world)
+
+    def on_update(self, delta_time):
+        """Загрузка уровня идет раз в кадр со своим бюджетом времени"""
+        if self.world.is_loading:
+            self.world.update(delta_time)
+
+    def on_fixed_update(self, delta_time):
+        """Шаг симуляции с фиксированным SIMULATION_RATE, независимо от частоты кадров"""
+        if not self.world.is_loading:
+            self.world.update(delta_time)
+
+    def on_key_press(self, key, modifiers):
+        """Обработка нажатия клавиш"""
+        world = self.world
+        if key == arcade.key.F3:
+            self.perf.toggle(world)
+            return
+        if world.is_loading:
+            return  # Игнорируем ввод во время загрузки
 
         if key == arcade.key.LEFT or key == arcade.key.A:
-            self.player_sprite.change_x = -current_move_speed
+            world.move_left()
         elif key == arcade.key.RIGHT or key == arcade.key.D:
-            self.player_sprite.change_x = current_move_speed
+            world.move_right()
         elif key == arcade.key.UP or key == arcade.key.W or key == arcade.key.SPACE:
-            if self.physics_engine.can_jump():
-                self.player_sprite.change_y = current_jump_speed
+            world.jump()
 
         # Покупка бонусов по клавишам
         elif key == arcade.key.KEY_1 or key == arcade.key.NUM_1:
-            self.buy_bonus("speed")
+            world.buy_bonus("speed")
         elif key == arcade.key.KEY_2 or key == arcade.key.NUM_2:
-            self.buy_bonus("jump")
+            world.buy_bonus("jump")
         elif key == arcade.key.KEY_3 or key == arcade.key.NUM_3:
-            self.buy_bonus("shield")
+            world.buy_bonus("shield")
 
     def on_key_release(self, key, modifiers):
         """Обработка отпускания клавиш"""
-        if self.is_loading:
+        world = self.world
+        if world.is_loading:
             return  # Игнорируем ввод во время загрузки
 
-        if (key == arcade.key.LEFT or key == arcade.key.A) and self.player_sprite.change_x < 0:
-            self.player_sprite.change_x = 0
-        elif (key == arcade.key.RIGHT or key == arcade.key.D) and self.player_sprite.change_x > 0:
-            self.player_sprite.change_x = 0
+        if key == arcade.key.LEFT or key == arcade.key.A:
+            world.stop_left()
+        elif key == arcade.key.RIGHT or key == arcade.key.D:
+            world.stop_right()
 
 
 # --------------------------------
 # Запуск игры
 # --------------------------------
 def main():
-    window = MyGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    window = MyGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, seed=LEVEL_SEED)
     window.setup()
     arcade.run()
 